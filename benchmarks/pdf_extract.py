@@ -0,0 +1,91 @@
+"""Compare serial and process-parallel PyMuPDF text extraction on a large PDF.
+
+    python -m benchmarks.pdf_extract                       # generates a 400-page fixture
+    python -m benchmarks.pdf_extract --pages 800 --images  # heavier, image-rich pages
+    python -m benchmarks.pdf_extract lecture.pdf --processes 2 4 8
+
+Without a PDF argument, a fixture of text-dense pages is generated in memory.
+"""
+import argparse
+import random
+import time
+
+import fitz  # PyMuPDF
+
+from utils import pdf_text
+
+WORDS = ("presentation audience analysis feedback posture speech transcript resume "
+         "interview confidence clarity structure evidence summary").split()
+
+
+def make_fixture(pages: int, images: bool = False, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    pixmap = None
+    if images:
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 600, 400), False)
+        pixmap.set_rect(pixmap.irect, (90, 140, 200))
+    for n in range(pages):
+        page = doc.new_page()
+        lines = [f"Page {n + 1}"] + [
+            " ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(55)
+        ]
+        page.insert_textbox(fitz.Rect(40, 40, 560, 800), "\n".join(lines), fontsize=8)
+        if pixmap is not None:
+            page.insert_image(fitz.Rect(300, 600, 560, 780), pixmap=pixmap)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def best_of(repeats: int, fn):
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(data: bytes, processes, repeats: int):
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+    print(f"PDF: {page_count} pages, {len(data) / 1e6:.1f} MB\n")
+    print(f"{'mode':<16}{'best (s)':>10}{'pages/s':>10}{'speedup':>10}")
+
+    serial, expected = best_of(repeats, lambda: list(pdf_text.iter_pdf_pages(data, parallel=False)))
+    print(f"{'serial':<16}{serial:>10.3f}{page_count / serial:>10.0f}{1.0:>10.2f}")
+
+    for n in processes:
+        pdf_text.shutdown_pdf_pool()
+        pdf_text.PDF_EXTRACT_PROCESSES = n
+        # Start the workers before timing; a real server keeps its pool warm
+        pdf_text.start_pdf_pool()
+        elapsed, pages = best_of(repeats, lambda: list(pdf_text.iter_pdf_pages_parallel(data, processes=n)))
+        if pages != expected:
+            raise SystemExit(f"parallel extraction with {n} processes returned different text")
+        print(f"{f'{n} processes':<16}{elapsed:>10.3f}{page_count / elapsed:>10.0f}{serial / elapsed:>10.2f}")
+    pdf_text.shutdown_pdf_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", nargs="?", help="PDF to extract; a fixture is generated when omitted")
+    parser.add_argument("--pages", type=int, default=400, help="pages in the generated fixture")
+    parser.add_argument("--images", action="store_true", help="add an image to every fixture page")
+    parser.add_argument("--processes", type=int, nargs="+", default=[2, 4],
+                        help="process counts to compare against serial extraction")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per mode; the fastest is reported")
+    args = parser.parse_args()
+
+    if args.pdf:
+        with open(args.pdf, "rb") as f:
+            data = f.read()
+    else:
+        data = make_fixture(args.pages, args.images)
+    run(data, args.processes, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare real-time factor (processing time / audio duration) across transcription backends.
+
+    python -m benchmarks.transcription_rtf lecture.mp3 --backends whisper faster-whisper --size base
+    python -m benchmarks.transcription_rtf clip.mp4 --backends faster-whisper:int8 faster-whisper:float32
+
+An RTF below 1.0 means faster than real time.
+"""
+import argparse
+import time
+
+from utils.media_ingest import SAMPLE_RATE, decode_audio_pcm
+from utils.transcription_backends import create_backend
+
+
+def run(audio_path: str, backends, size: str, repeats: int):
+    audio = decode_audio_pcm(audio_path)
+    duration = len(audio) / float(SAMPLE_RATE)
+    print(f"Audio: {audio_path} ({duration:.1f}s)\n")
+    print(f"{'backend':<28}{'load (s)':>10}{'best (s)':>10}{'RTF':>8}{'segments':>10}")
+
+    for spec in backends:
+        name, _, compute_type = spec.partition(":")
+        try:
+            start = time.perf_counter()
+            backend = create_backend(name, size, compute_type or None)
+            load_time = time.perf_counter() - start
+        except Exception as e:
+            print(f"{spec:<28} unavailable: {e}")
+            continue
+
+        timings = []
+        result = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = backend.transcribe(audio)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print(f"{spec:<28}{load_time:>10.2f}{best:>10.2f}{best / duration:>8.3f}{len(result['segments']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", help="audio or video file to transcribe")
+    parser.add_argument("--backends", nargs="+", default=["whisper", "faster-whisper:int8", "whisper.cpp"],
+                        help="backend[:compute_type] entries to compare")
+    parser.add_argument("--size", default="base", help="model size for every backend")
+    parser.add_argument("--repeats", type=int, default=1, help="runs per backend; the fastest is reported")
+    args = parser.parse_args()
+    run(args.audio, args.backends, args.size, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
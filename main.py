@@ -1,23 +1,16 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse
-from pydantic import BaseModel
-from typing import Optional
-from pathlib import Path
-from PyPDF2 import PdfReader
+from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
 import os
-import fitz  # PyMuPDF
-from tempfile import NamedTemporaryFile
+import tempfile
 from dotenv import load_dotenv
 load_dotenv()
-from langchain.text_splitter import CharacterTextSplitter
-from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.chains.summarize import load_summarize_chain
-import shutil
 import subprocess
 import sys
+import asyncio
 import uvicorn
 app = FastAPI()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -32,6 +25,24 @@ except Exception as e:
     transcribe_audio = None
     print(f"Transcriber failed: {e}")
 
+try:
+    from utils.transcriber import iter_transcript_segments
+    from utils.parallel_transcriber import shutdown_transcribe_pool, start_transcribe_pool
+    from utils.sse import SSE_HEADERS, iterate_in_thread, sse_event
+    print("Streaming transcriber loaded")
+except Exception as e:
+    iter_transcript_segments = None
+    shutdown_transcribe_pool = None
+    start_transcribe_pool = None
+    print(f"Streaming transcriber failed: {e}")
+
+try:
+    from utils.media_ingest import ingest_media
+    print("Media ingest loaded")
+except Exception as e:
+    ingest_media = None
+    print(f"Media ingest failed: {e}")
+
 try:
     from utils.body_language import analyze_body_language
     print("Body language analyzer loaded")
@@ -39,6 +50,13 @@ except Exception as e:
     analyze_body_language = None
     print(f"Body language analyzer failed: {e}")
 
+try:
+    from utils.pose_pool import get_pose_pool
+    print("Pose pool loaded")
+except Exception as e:
+    get_pose_pool = None
+    print(f"Pose pool failed: {e}")
+
 try:
     from utils.speech_analysis import analyze_speech
     print("Speech analyzer loaded")
@@ -47,10 +65,14 @@ except Exception as e:
     print(f"Speech analyzer failed: {e}")
 
 try:
-    from utils.feedback_generator import generate_feedback
+    from utils.feedback_generator import generate_feedback, generate_feedback_async, stream_feedback
+    from utils.llm_client import get_llm_client
     print("Feedback generator loaded")
 except Exception as e:
     generate_feedback = None
+    generate_feedback_async = None
+    stream_feedback = None
+    get_llm_client = None
     print(f"Feedback generator failed: {e}")
 
 try:
@@ -84,13 +106,21 @@ except Exception as e:
     print(f"Job Scraper failed: {e}")
 
 try:
-    from utils.pdf_summarizer import PDFSummarizer
+    from utils.pdf_summarizer import EmptyPDFError, PDFSummarizer
     pdf_summarizer = PDFSummarizer()
     print("PDF Summarizer loaded")
 except Exception as e:
     pdf_summarizer = None
     print(f"PDF Summarizer failed: {e}")
 
+try:
+    from utils.pdf_text import extract_pdf_text_cached, shutdown_pdf_pool, start_pdf_pool
+except Exception as e:
+    extract_pdf_text_cached = None
+    shutdown_pdf_pool = None
+    start_pdf_pool = None
+    print(f"PDF text extraction failed: {e}")
+
 try:
     from utils.youtube_converter import YouTubeConverter
 
@@ -102,12 +132,62 @@ except Exception as e:
     print(f"YouTube Converter failed: {e}")
 
 try:
-    from pipeline import run_analysis_pipeline
+    from utils.model_registry import whisper_registry, warmup_whisper_models
+    print("Model registry loaded")
+except Exception as e:
+    whisper_registry = None
+    warmup_whisper_models = None
+    print(f"Model registry failed: {e}")
+
+try:
+    from pipeline import (
+        run_analysis_pipeline, run_analyzers_async, AnalyzerError, start_analysis_executor,
+        shutdown_analysis_executor, ANALYZER_VERSIONS
+    )
     print("Pipeline loaded")
 except Exception as e:
     run_analysis_pipeline = None
+    ANALYZER_VERSIONS = {}
+    run_analyzers_async = None
+    start_analysis_executor = None
+    shutdown_analysis_executor = None
+    AnalyzerError = Exception
     print(f"Pipeline failed: {e}")
 
+try:
+    from utils.uploads import stream_upload_to_disk
+    print("Upload streaming loaded")
+except Exception as e:
+    stream_upload_to_disk = None
+    print(f"Upload streaming failed: {e}")
+
+try:
+    from utils.result_cache import DiskCache, cache_key, hash_file
+    result_cache = DiskCache(
+        os.getenv("RESULT_CACHE_DIR", "temp/result_cache"),
+        max_bytes=int(float(os.getenv("RESULT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+    )
+    print("Result cache loaded")
+except Exception as e:
+    result_cache = None
+    print(f"Result cache failed: {e}")
+
+try:
+    from utils.job_queue import JobQueue, QueueFullError
+    analysis_jobs = JobQueue(
+        stages=["ingest", "analyze", "feedback", "report"],
+        max_workers=int(os.getenv("ANALYSIS_JOB_WORKERS", "2")),
+        max_pending=int(os.getenv("ANALYSIS_JOB_QUEUE_SIZE", "16")),
+        results_dir=os.getenv("ANALYSIS_JOB_DIR", "temp/jobs"),
+        max_stored_jobs=int(os.getenv("ANALYSIS_JOB_MAX_STORED", "1000")),
+        retention_seconds=float(os.getenv("ANALYSIS_JOB_RETENTION_HOURS", "24")) * 3600
+    )
+    print("Analysis job queue loaded")
+except Exception as e:
+    analysis_jobs = None
+    QueueFullError = Exception
+    print(f"Analysis job queue failed: {e}")
+
 # --- Env & Directory Setup ---
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 CHAT_URL = os.getenv("CHAT_URL", "http://localhost:5000")
@@ -129,6 +209,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Model Warm-up & Eviction ---
+async def _evict_idle_models():
+    while True:
+        await asyncio.sleep(60)
+        whisper_registry.evict_idle()
+        whisper_registry.enforce_memory_limits()
+
+@app.on_event("startup")
+async def start_worker_pools():
+    # Registered first: worker processes are forked before warm-up starts threads and loads models
+    if start_transcribe_pool:
+        try:
+            start_transcribe_pool()
+        except Exception as e:
+            print(f"Transcription pool failed to start: {e}")
+    if start_pdf_pool:
+        try:
+            start_pdf_pool()
+        except Exception as e:
+            print(f"PDF extraction pool failed to start: {e}")
+    if start_analysis_executor:
+        try:
+            start_analysis_executor()
+        except Exception as e:
+            print(f"Analysis executor failed to start: {e}")
+
+@app.on_event("startup")
+async def warmup_models():
+    if get_pose_pool:
+        try:
+            count = await asyncio.get_running_loop().run_in_executor(None, get_pose_pool().warmup)
+            print(f"Pose pool warmed up: {count} graphs")
+        except Exception as e:
+            print(f"Pose pool warm-up failed: {e}")
+    if not whisper_registry:
+        return
+    try:
+        sizes = await asyncio.get_running_loop().run_in_executor(None, warmup_whisper_models)
+        print(f"Whisper models warmed up: {sizes}")
+    except Exception as e:
+        print(f"Whisper warm-up failed: {e}")
+    asyncio.create_task(_evict_idle_models())
+
+@app.on_event("startup")
+async def start_job_workers():
+    if analysis_jobs:
+        analysis_jobs.start()
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    if analysis_jobs:
+        await analysis_jobs.stop()
+    if shutdown_analysis_executor:
+        shutdown_analysis_executor()
+    if shutdown_transcribe_pool:
+        shutdown_transcribe_pool()
+    if get_llm_client:
+        await get_llm_client().aclose()
+    if pdf_summarizer:
+        await pdf_summarizer.aclose()
+    if shutdown_pdf_pool:
+        shutdown_pdf_pool()
+
 # --- Static Mounting ---
 app.mount("/static", StaticFiles(directory="static"), name="static")
 if os.path.exists(".next/static"):
@@ -141,6 +284,11 @@ class ATSRequest(BaseModel):
     resume_text: str
     job_description: str
 
+class ATSBatchRequest(BaseModel):
+    resume_text: str
+    job_descriptions: List[str] = Field(..., min_length=1)
+    top_k: Optional[int] = Field(None, ge=1)
+
 class JobSearchRequest(BaseModel):
     keyword: str = "developer"
     location: str = "bangalore"
@@ -154,6 +302,23 @@ class YouTubeRequest(BaseModel):
     language: str = "en"
 
 
+# /api/analyze reads the multipart body itself, so describe the upload field for the docs
+VIDEO_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}}
+                }
+            }
+        }
+    }
+}
+
+
 class AnalysisResult(BaseModel):
     transcript: str
     speech_score: int
@@ -166,12 +331,11 @@ class AnalysisResult(BaseModel):
 # --- Utility ---
 
 
-def extract_text_from_pdf(file: UploadFile) -> str:
-    try:
-        reader = PdfReader(file.file)
-        return "\n".join([page.extract_text() or "" for page in reader.pages])
-    except Exception as e:
-        return f"Error reading PDF: {e}"
+async def extract_text_from_pdf(file: UploadFile) -> str:
+    """PyMuPDF text of an uploaded PDF, cached by content hash"""
+    data = await file.read()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, extract_pdf_text_cached, data)
 
 # --- Routes ---
 @app.get("/")
@@ -203,6 +367,15 @@ async def health_check():
         }
     }
 
+@app.get("/api/models")
+async def model_stats():
+    if not whisper_registry:
+        raise HTTPException(status_code=503, detail="Model registry unavailable")
+    return {
+        "whisper": whisper_registry.stats(),
+        "resident_bytes": whisper_registry.resident_bytes()
+    }
+
 @app.get("/chat", response_class=HTMLResponse)
 async def proxy_chat():
     try:
@@ -225,9 +398,10 @@ async def proxy_chat():
 async def score_resume(resume: UploadFile, job_description: str = Form(...)):
     if resume.content_type != "application/pdf":
         return JSONResponse(status_code=400, content={"error": "Only PDF resumes are accepted."})
-    resume_text = extract_text_from_pdf(resume)
-    if "Error" in resume_text:
-        return JSONResponse(status_code=500, content={"error": resume_text})
+    try:
+        resume_text = await extract_text_from_pdf(resume)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Error reading PDF: {e}"})
     result = ats_calculator.calculate_ats_score(resume_text, job_description)
     return result
 
@@ -237,65 +411,159 @@ async def ats_score(request: ATSRequest):
         raise HTTPException(status_code=503, detail="ATS Calculator unavailable")
     return ats_calculator.calculate_ats_score(request.resume_text, request.job_description)
 
-@app.post("/api/analyze", response_model=AnalysisResult)
-async def analyze_video(file: UploadFile = File(...)):
+@app.post("/ats/score-batch")
+async def ats_score_batch(request: ATSBatchRequest):
+    if not ats_calculator:
+        raise HTTPException(status_code=503, detail="ATS Calculator unavailable")
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(
+        None, ats_calculator.calculate_ats_scores, request.resume_text, request.job_descriptions, request.top_k
+    )
+    return {"count": len(request.job_descriptions), "results": results}
+
+@app.post("/api/analyze", response_model=AnalysisResult, openapi_extra=VIDEO_UPLOAD_OPENAPI)
+async def analyze_video(request: Request):
     print("HELLO ANALYSER")
-    os.makedirs("temp", exist_ok=True)
+    if not stream_upload_to_disk:
+        raise HTTPException(status_code=503, detail="Upload handling unavailable")
     os.makedirs("static/reports", exist_ok=True)
-    # Extract safe filename
-    filename = Path(file.filename).name
-    file_path = os.path.join("temp", filename)
+    # Stream the upload straight to a unique temp file, hashing it in the same pass
+    upload = await stream_upload_to_disk(request, "temp")
+    print("filename", upload["path"], upload["size"], "bytes")
 
-    # Delete old temp file if it exists
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    try:
+        return await run_video_analysis(upload["path"], upload["stored_name"], content_hash=upload["sha256"])
+    finally:
+        if os.path.exists(upload["path"]):
+            os.remove(upload["path"])
+
+
+def _report_progress(progress, stage: str, status: str):
+    if progress:
+        progress(stage, status)
+
+
+async def _cached_analysis(key: str, progress=None) -> Optional[AnalysisResult]:
+    loop = asyncio.get_running_loop()
+    cached = await loop.run_in_executor(None, result_cache.get, key)
+    if not cached:
+        return None
+    result = AnalysisResult(**cached)
+
+    # The report may have been cleaned up since; it is cheap to rebuild from the cached fields
+    pdf_path = result.pdf_url.lstrip("/")
+    if not os.path.exists(pdf_path):
+        await loop.run_in_executor(
+            None, generate_pdf_report, result.transcript, result.speech_score,
+            result.body_language_score, result.feedback, pdf_path
+        )
+    for stage in ("ingest", "analyze", "feedback", "report"):
+        _report_progress(progress, stage, "done")
+    print("✅ Result cache hit")
+    return result
 
-    print("filename", file_path)
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-        try:
-            transcript = transcribe_audio(file_path)
-            print("✅ Transcript done")
-        except Exception as e:
-            print("❌ Error in transcribe_audio:", e)
-            raise HTTPException(status_code=500, detail=f"transcribe_audio error: {e}")
-        try:
-            speech_score = analyze_speech(file_path)
-            print("✅ Speech analysis done")
-        except Exception as e:
-            print("❌ Error in analyze_speech:", e)
-            raise HTTPException(status_code=500, detail=f"analyze_speech error: {e}")
 
+async def _streamed_feedback(transcript: str, speech_score: int, body_language_score: int,
+                             on_token) -> Tuple[str, bool]:
+    """Forward feedback tokens to on_token as they arrive.
+
+    Returns the assembled text and whether the stream completed; a stream cut off after
+    the first token still yields its partial text for the report, but must not be cached.
+    """
+    pieces = []
+    try:
+        async for token in stream_feedback(transcript, speech_score, body_language_score):
+            pieces.append(token)
+            on_token(token)
+    except Exception as e:
+        # Same contract as generate_feedback: the report is still built around an error message
+        if not pieces:
+            return f"Error generating feedback: {str(e) or type(e).__name__}", False
+        print("❌ Feedback stream interrupted:", e)
+        return "".join(pieces).strip(), False
+    return "".join(pieces).strip(), True
+
+
+async def run_video_analysis(file_path: str, filename: str, progress=None,
+                             content_hash: Optional[str] = None, on_token=None) -> AnalysisResult:
+    """Ingest, analyze, generate feedback and build the PDF report for a saved upload.
+
+    When on_token is given, feedback is streamed and each piece is passed to it as it arrives.
+    """
+    loop = asyncio.get_running_loop()
+
+    # Identical uploads analyzed by the same analyzer versions are served from the cache
+    key = None
+    if result_cache:
         try:
-            body_language_score = analyze_body_language(file_path)
-            print("✅ Body language analysis done")
+            if content_hash is None:
+                content_hash = await loop.run_in_executor(None, hash_file, file_path)
+            key = cache_key(content_hash, ANALYZER_VERSIONS)
+            cached = await _cached_analysis(key, progress)
+            if cached:
+                return cached
         except Exception as e:
-            print("❌ Error in analyze_body_language:", e)
-            raise HTTPException(status_code=500, detail=f"body_language_score error: {e}")
+            print("❌ Error in result cache lookup:", e)
 
+    # Demux once: shared 16 kHz PCM buffer + frame source for every analyzer
+    _report_progress(progress, "ingest", "running")
+    try:
+        media = await loop.run_in_executor(None, ingest_media, file_path)
+        print("✅ Media ingest done")
+    except Exception as e:
+        print("❌ Error in ingest_media:", e)
+        _report_progress(progress, "ingest", "failed")
+        raise HTTPException(status_code=500, detail=f"ingest_media error: {e}")
+    _report_progress(progress, "ingest", "done")
+
+    # Transcription, speech and body-language analysis run in parallel off the event loop
+    _report_progress(progress, "analyze", "running")
+    with media:
         try:
-            feedback = generate_feedback(transcript, speech_score, body_language_score)
-            print("✅ Feedback generation done")
-        except Exception as e:
-            print("❌ Error in generate_feedback:", e)
-            raise HTTPException(status_code=500, detail=f"generate_feedback error: {e}")
+            transcript, speech_score, body_language_score = await run_analyzers_async(file_path, media)
+            print("✅ Transcript, speech and body language analysis done")
+        except AnalyzerError as e:
+            print(f"❌ Error in {e.stage}:", e.error)
+            _report_progress(progress, "analyze", "failed")
+            raise HTTPException(status_code=500, detail=str(e))
+    _report_progress(progress, "analyze", "done")
+
+    _report_progress(progress, "feedback", "running")
+    try:
+        if on_token:
+            feedback, feedback_complete = await _streamed_feedback(
+                transcript, speech_score, body_language_score, on_token
+            )
+        else:
+            feedback = await generate_feedback_async(transcript, speech_score, body_language_score)
+            feedback_complete = True
+        print("✅ Feedback generation done")
+    except Exception as e:
+        print("❌ Error in generate_feedback:", e)
+        _report_progress(progress, "feedback", "failed")
+        raise HTTPException(status_code=500, detail=f"generate_feedback error: {e}")
+    _report_progress(progress, "feedback", "done")
 
+    _report_progress(progress, "report", "running")
     try:
         pdf_filename = filename.replace(".mp4", "_report.pdf")
         pdf_path = os.path.join("static", "reports", pdf_filename)
         if os.path.exists(pdf_path):
             os.remove(pdf_path)
-        generate_pdf_report(transcript, speech_score, body_language_score, feedback, pdf_path)
+        await loop.run_in_executor(
+            None, generate_pdf_report, transcript, speech_score, body_language_score, feedback, pdf_path
+        )
         print("✅ PDF generation done")
     except Exception as e:
         print("❌ Error in generate_pdf_report:", e)
     #raise HTTPException(status_code=500, detail=f"generate_pdf_report error: {e}"
+    _report_progress(progress, "report", "done")
     print("This is transcript",transcript,"\n")
     print("This is speech_score",speech_score,"\n")
     print("This is feedback",feedback,"\n")
     print("This is body_language_score",body_language_score,"\n")
     
-    return AnalysisResult(
+    result = AnalysisResult(
         transcript=transcript,
         speech_score=speech_score,
         body_language_score=body_language_score,
@@ -303,6 +571,109 @@ async def analyze_video(file: UploadFile = File(...)):
         feedback=feedback,
         pdf_url=f"/static/reports/{pdf_filename}"
     )
+    if key and feedback_complete and not feedback.startswith("Error"):
+        try:
+            await loop.run_in_executor(None, result_cache.put, key, result.model_dump())
+        except Exception as e:
+            print("❌ Error in result cache store:", e)
+    return result
+
+
+@app.post("/api/analyze/stream", openapi_extra=VIDEO_UPLOAD_OPENAPI)
+async def analyze_video_stream(request: Request):
+    """Like /api/analyze, but as SSE: stage updates, feedback tokens, then the final result"""
+    if not stream_feedback or not stream_upload_to_disk:
+        raise HTTPException(status_code=503, detail="Feedback generator unavailable")
+    os.makedirs("static/reports", exist_ok=True)
+    upload = await stream_upload_to_disk(request, "temp")
+
+    async def events():
+        queue: asyncio.Queue = asyncio.Queue()
+        analysis = asyncio.create_task(run_video_analysis(
+            upload["path"], upload["stored_name"], content_hash=upload["sha256"],
+            progress=lambda stage, status: queue.put_nowait(("stage", {"stage": stage, "status": status})),
+            on_token=lambda token: queue.put_nowait(("token", {"text": token})),
+        ))
+        analysis.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield sse_event(*item)
+
+            if analysis.exception():
+                error = analysis.exception()
+                yield sse_event("error", {"detail": getattr(error, "detail", None) or str(error)})
+            else:
+                yield sse_event("result", analysis.result().model_dump())
+        finally:
+            # Client disconnected mid-stream: stop the analysis instead of finishing it for nobody
+            if not analysis.done():
+                analysis.cancel()
+            if os.path.exists(upload["path"]):
+                os.remove(upload["path"])
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def _analysis_job(file_path: str, filename: str, progress=None, content_hash: Optional[str] = None) -> dict:
+    try:
+        result = await run_video_analysis(file_path, filename, progress=progress, content_hash=content_hash)
+        return result.model_dump()
+    except HTTPException as e:
+        raise RuntimeError(e.detail)
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+@app.post("/api/analyze/jobs", status_code=202, openapi_extra=VIDEO_UPLOAD_OPENAPI)
+async def submit_analysis_job(request: Request):
+    if not analysis_jobs or not stream_upload_to_disk:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+    # Refuse before reading the body so rejected clients do not upload the whole video first
+    if analysis_jobs.is_full:
+        raise HTTPException(
+            status_code=429, detail=f"Job queue is full ({analysis_jobs.max_pending} pending)",
+            headers={"Retry-After": "30"}
+        )
+    upload = await stream_upload_to_disk(request, "temp")
+    file_path = upload["path"]
+
+    try:
+        job = analysis_jobs.submit(
+            _analysis_job, file_path, upload["stored_name"], content_hash=upload["sha256"]
+        )
+    except QueueFullError as e:
+        os.remove(file_path)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return {
+        **job,
+        "status_url": f"/api/analyze/jobs/{job['job_id']}",
+        "result_url": f"/api/analyze/jobs/{job['job_id']}/result"
+    }
+
+
+@app.get("/api/analyze/jobs/{job_id}")
+async def analysis_job_status(job_id: str):
+    job = analysis_jobs.get(job_id) if analysis_jobs else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {**job, "queue_depth": analysis_jobs.pending}
+
+
+@app.get("/api/analyze/jobs/{job_id}/result", response_model=AnalysisResult)
+async def analysis_job_result(job_id: str):
+    job = analysis_jobs.get_result(job_id) if analysis_jobs else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return job["result"]
 
 
 class YouTubeRequest(BaseModel):
@@ -321,63 +692,94 @@ async def convert_youtube(request: YouTubeRequest):
         print("This is error block",f"YouTube conversion failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"YouTube conversion failed: {str(e)}")
 
-@app.post("/api/summarize")
-async def summarize_pdf(file: UploadFile = File(...)):
-    print("Mai function ko hit toh kar raha hu")
-    llm = ChatGroq(
-        groq_api_key=GROQ_API_KEY,
-        model_name="llama3-8b-8192"
-    )
-    SUMMARY_PROMPT = PromptTemplate.from_template("""
-    Summarize the following content clearly and concisely:
+async def _segment_events(segments):
+    """SSE stream of transcript segments followed by a final 'done' event with the full text"""
+    texts = []
+    language = None
+    async for segment in segments:
+        texts.append(segment["text"])
+        language = language or segment.get("language")
+        yield sse_event("segment", segment)
+    yield sse_event("done", {"text": " ".join(texts).strip(), "language": language})
 
-    "{text}"
 
-    Summary:
-    """)
-    if not file.filename.endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed.")
+@app.post("/api/transcribe/stream", openapi_extra=VIDEO_UPLOAD_OPENAPI)
+async def transcribe_stream(request: Request):
+    if not iter_transcript_segments or not stream_upload_to_disk:
+        raise HTTPException(status_code=503, detail="Transcriber unavailable")
+    upload = await stream_upload_to_disk(request, "temp")
 
-    try:
-        print("Save uploaded PDF temporarily")
-        with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(await file.read())
-            tmp_path = tmp.name
+    async def events():
+        try:
+            async for event in _segment_events(iterate_in_thread(iter_transcript_segments, upload["path"])):
+                yield event
+        except Exception as e:
+            print("❌ Error in streaming transcription:", e)
+            yield sse_event("error", {"detail": str(e)})
+        finally:
+            if os.path.exists(upload["path"]):
+                os.remove(upload["path"])
 
-        
-        text = ""
-        with fitz.open(tmp_path) as doc:
-            print("Extract text from PDF using PyMuPDF")
-            for page in doc:
-                text += page.get_text()
-                print("Extract text from PDF using PyMuPDF, this is text", text)
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
-        os.remove(tmp_path)  # Clean up
+@app.post("/api/youtube-transcript/stream")
+async def convert_youtube_stream(request: YouTubeRequest):
+    if not youtube_converter or not iter_transcript_segments:
+        raise HTTPException(status_code=503, detail="YouTube Converter service not available")
 
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="No readable text found in PDF.")
+    async def events():
+        loop = asyncio.get_running_loop()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                audio_output = os.path.join(temp_dir, "audio.%(ext)s")
+                video_info = await loop.run_in_executor(
+                    None, youtube_converter.download_youtube_audio, request.url, audio_output
+                )
+                yield sse_event("video_info", video_info)
+
+                segments = []
+                async for segment in iterate_in_thread(iter_transcript_segments, video_info["audio_path"]):
+                    segments.append(segment)
+                    yield sse_event("segment", segment)
+
+                transcript_data = {
+                    "full_text": " ".join(seg["text"] for seg in segments).strip(),
+                    "segments": segments,
+                    "language": segments[0]["language"] if segments else None
+                }
+                final_path = os.path.join("public", "pdfs", "transcript.pdf")
+                await loop.run_in_executor(
+                    None, youtube_converter.generate_transcript_pdf, video_info, transcript_data, final_path
+                )
+                yield sse_event("done", {
+                    "text": transcript_data["full_text"],
+                    "language": transcript_data["language"],
+                    "pdf_url": "/pdfs/transcript.pdf"
+                })
+            except Exception as e:
+                print("❌ Error in streaming YouTube transcription:", e)
+                yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
-        # Split large text into chunks
-        splitter = CharacterTextSplitter.from_tiktoken_encoder(
-            chunk_size=1500,
-            chunk_overlap=200
-        )
-        docs = splitter.create_documents([text])
-
-        
-        chain = load_summarize_chain(
-            llm=llm,
-            chain_type="map_reduce",
-            map_prompt=SUMMARY_PROMPT,
-            combine_prompt=SUMMARY_PROMPT
-        )
-        summary_result = chain.invoke(docs)
-        print("Create summarization chain", summary_result)
-        return JSONResponse({"summary": summary_result['output_text']})
+@app.post("/api/summarize")
+async def summarize_pdf(file: UploadFile = File(...)):
+    if not pdf_summarizer:
+        raise HTTPException(status_code=503, detail="PDF Summarizer unavailable")
+    if not file.filename.endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed.")
 
+    try:
+        result = await pdf_summarizer.asummarize_pdf(await file.read())
+        print(f"✅ Summarized {result['chunks']} chunks in {result['total_seconds']:.2f}s "
+              f"(map {result['map_seconds']:.2f}s, {result['reduce_levels']} reduce levels)")
+        summary = result.pop("summary")
+        return JSONResponse({"summary": summary, "timings": result})
+    except EmptyPDFError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print("NOTA", e)
+        print("❌ Error in summarize_pdf:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/{path:path}")
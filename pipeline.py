@@ -1,16 +1,121 @@
-from utils.transcriber import transcribe_audio
-from utils.body_language import analyze_body_language
-from utils.speech_analysis import analyze_speech
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from utils.media_ingest import MediaBundle, ingest_media
+from utils.model_registry import TRANSCRIBE_BACKEND, WHISPER_COMPUTE_TYPE, WHISPER_MODEL_SIZE
+from utils.transcriber import transcribe_audio_segments
+from utils.body_language import (
+    BODY_LANGUAGE_FPS, BODY_LANGUAGE_MAX_WIDTH, BODY_LANGUAGE_MODE, analyze_body_language
+)
+from utils.pose_pool import POSE_MODEL_COMPLEXITY
+from utils.speech_analysis import compute_acoustic_metrics, compute_transcript_metrics, score_speech
 from utils.feedback_generator import generate_feedback
 from utils.report_generator import generate_pdf_report
 
+# "thread" (default) shares loaded models and the PCM buffer; "process" sidesteps the GIL
+# at the cost of copying the audio into each worker and loading models per process.
+ANALYSIS_EXECUTOR = os.getenv("ANALYSIS_EXECUTOR", "thread")
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "3"))
+
+_executor: Optional[Executor] = None
+
+# Bump the matching entry whenever an analyzer's output changes, so cached results are not reused
+ANALYZER_VERSIONS = {
+    "transcriber": f"{TRANSCRIBE_BACKEND}-{WHISPER_MODEL_SIZE}-{WHISPER_COMPUTE_TYPE or 'default'}",
+    "speech": "3",
+    "body_language": f"2-{BODY_LANGUAGE_MODE}-{BODY_LANGUAGE_FPS}-{BODY_LANGUAGE_MAX_WIDTH}-{POSE_MODEL_COMPLEXITY}",
+    "feedback": "llama3-8b-8192-budget1",
+}
+
+
+class AnalyzerError(Exception):
+    """Raised when one of the analyzers fails; keeps the failing stage name"""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"{stage} error: {error}")
+        self.stage = stage
+        self.error = error
+
+
+def get_analysis_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if ANALYSIS_EXECUTOR == "process":
+            # Forked up front by start_analysis_executor, like the transcription pool
+            _executor = ProcessPoolExecutor(
+                max_workers=ANALYSIS_WORKERS, mp_context=multiprocessing.get_context("fork")
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analyzer")
+    return _executor
+
+
+def start_analysis_executor() -> None:
+    """Fork the process workers now; call at startup, before the server starts threads"""
+    if ANALYSIS_EXECUTOR == "process":
+        get_analysis_executor().submit(os.getpid).result()
+
+
+def shutdown_analysis_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def _submit_analyzers(executor: Executor, video_path: str, media: MediaBundle):
+    return {
+        "transcribe_audio": executor.submit(transcribe_audio_segments, video_path, audio=media.audio),
+        "analyze_speech": executor.submit(compute_acoustic_metrics, video_path, audio=media.audio),
+        "analyze_body_language": executor.submit(analyze_body_language, video_path, frames=media.frames),
+    }
+
+
+def _combine_results(results) -> Tuple[str, int, int]:
+    # Pacing and filler metrics need the transcript, so they are folded in once both are back
+    transcription, acoustic, body_score = results
+    try:
+        metrics = dict(acoustic, **compute_transcript_metrics(transcription, acoustic["duration"]))
+        speech_score = score_speech(metrics)
+    except Exception as e:
+        raise AnalyzerError("analyze_speech", e)
+    print("Speech metrics:", metrics)
+    return transcription["text"], speech_score, body_score
+
+
+async def run_analyzers_async(video_path: str, media: MediaBundle) -> Tuple[str, int, int]:
+    """Run transcription, speech and body-language analysis in parallel off the event loop"""
+    futures = _submit_analyzers(get_analysis_executor(), video_path, media)
+    wrapped = [asyncio.wrap_future(future) for future in futures.values()]
+    results = await asyncio.gather(*wrapped, return_exceptions=True)
+
+    for stage, result in zip(futures, results):
+        if isinstance(result, Exception):
+            raise AnalyzerError(stage, result)
+    return _combine_results(results)
+
+
+def run_analyzers(video_path: str, media: MediaBundle) -> Tuple[str, int, int]:
+    """Blocking variant of run_analyzers_async for scripts and worker threads"""
+    futures = _submit_analyzers(get_analysis_executor(), video_path, media)
+    results = []
+    for stage, future in futures.items():
+        try:
+            results.append(future.result())
+        except Exception as e:
+            raise AnalyzerError(stage, e)
+    return _combine_results(results)
+
+
 def run_analysis_pipeline(video_path: str) -> str:
-    transcript = transcribe_audio(video_path)
-    speech_score = analyze_speech(video_path)
-    body_score = analyze_body_language(video_path)
+    with ingest_media(video_path) as media:
+        transcript, speech_score, body_score = run_analyzers(video_path, media)
     feedback = generate_feedback(transcript, speech_score, body_score)
 
     output_path = "static/reports/analysis_report.pdf"
     generate_pdf_report(transcript, speech_score, body_score, feedback, output_path)
 
-    return output_path
\ No newline at end of file
+    return output_path
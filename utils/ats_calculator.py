@@ -1,10 +1,11 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 import nltk
 import string
 import re
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -116,6 +117,91 @@ class ATSCalculator:
                 "recommendations": ["Please check your input text and try again."]
             }
 
+    def _top_terms(self, counts, row: int, feature_names, top_n: int) -> List[str]:
+        """Most frequent terms of one document, highest count first, ties alphabetical"""
+        start, end = counts.indptr[row], counts.indptr[row + 1]
+        values = counts.data[start:end]
+        columns = counts.indices[start:end]
+        order = np.lexsort((columns, -values))[:top_n]
+        return [feature_names[columns[i]] for i in order]
+
+    def calculate_ats_scores(self, resume_text: str, job_descriptions: List[str],
+                             top_k: Optional[int] = None) -> List[Dict]:
+        """Score one resume against many job descriptions, best match first.
+
+        One vocabulary is fitted over the resume and every job; all cosine similarities come
+        from a single sparse product of the L2-normalised TF-IDF rows. Each result carries the
+        job's position in the input as "index" plus the fields of calculate_ats_score.
+        top_k, when given, must be positive and keeps only the best top_k results.
+        """
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+        resume_clean = self.preprocess(resume_text)
+        jobs_clean = [self.preprocess(job) for job in job_descriptions]
+        valid = [i for i, job in enumerate(jobs_clean) if job]
+
+        results = []
+        for i in range(len(job_descriptions)):
+            if not resume_clean or not jobs_clean[i]:
+                results.append({
+                    "index": i,
+                    "overall_score": 0,
+                    "keyword_match": 0,
+                    "missing_keywords": [],
+                    "matched_keywords": [],
+                    "recommendations": ["Please provide valid resume and job description text."]
+                })
+
+        if resume_clean and valid:
+            try:
+                # Single-document TF-IDF keywords (extract_keywords) rank terms by raw count,
+                # so the shared count matrix serves both the keywords and the TF-IDF vectors
+                counter = CountVectorizer(ngram_range=(1, 2), stop_words='english')
+                counts = counter.fit_transform([resume_clean] + [jobs_clean[i] for i in valid]).tocsr()
+                feature_names = counter.get_feature_names_out()
+                vectors = TfidfTransformer().fit_transform(counts)
+                similarities = (vectors[1:] @ vectors[0].T).toarray().ravel()
+
+                resume_keywords_set = set(self._top_terms(counts, 0, feature_names, self.TOP_RESUME_KEYWORDS))
+                resume_keywords = self._top_terms(counts, 0, feature_names, 15)
+
+                for row, i in enumerate(valid, start=1):
+                    job_keywords = self._top_terms(counts, row, feature_names, self.TOP_JOB_KEYWORDS)
+                    job_keywords_set = set(job_keywords[:self.KEYWORDS_TO_MATCH])
+                    matched_keywords = list(job_keywords_set & resume_keywords_set)
+                    missing_keywords = list(job_keywords_set - resume_keywords_set)
+
+                    similarity_score = float(similarities[row - 1])
+                    keyword_match_score = (len(matched_keywords) / len(job_keywords_set)) * 100 if job_keywords_set else 0
+                    overall_score = (similarity_score * 0.6 + (keyword_match_score / 100) * 0.4) * 100
+
+                    results.append({
+                        "index": i,
+                        "overall_score": round(overall_score, 2),
+                        "similarity_score": round(similarity_score * 100, 2),
+                        "keyword_match": round(keyword_match_score, 2),
+                        "matched_keywords": matched_keywords[:10],
+                        "missing_keywords": missing_keywords[:10],
+                        "recommendations": self.generate_recommendations(
+                            overall_score, missing_keywords, matched_keywords
+                        ),
+                        "job_keywords": job_keywords[:15],
+                        "resume_keywords": resume_keywords
+                    })
+            except Exception as e:
+                logging.error(f"Error calculating batch ATS scores: {e}")
+                return [{
+                    "index": i,
+                    "overall_score": 0,
+                    "error": f"Error calculating ATS score: {str(e)}",
+                    "recommendations": ["Please check your input text and try again."]
+                } for i in range(len(job_descriptions))]
+
+        results.sort(key=lambda result: (-result["overall_score"], result["index"]))
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
+        return results if top_k is None else results[:top_k]
+
     def generate_recommendations(self, score: float, missing_keywords: List[str], matched_keywords: List[str]) -> List[str]:
         """Generate personalized recommendations based on ATS analysis"""
         recommendations = []
@@ -1,37 +1,133 @@
+import os
 import cv2
-import mediapipe as mp
+from typing import Dict, Iterable, Iterator, Optional, Union
+import numpy as np
+from utils.media_ingest import FrameSource
+from utils.pose_pool import get_pose_pool
+from utils.posture_metrics import (
+    LEFT_SHOULDER, RIGHT_SHOULDER, empty_frame, landmarks_to_array, save_track, score_track, stack_track
+)
 
-def analyze_body_language(video_path: str) -> int:
-    mp_pose = mp.solutions.pose
-    pose = mp_pose.Pose()
-    cap = cv2.VideoCapture(video_path)
+# Sampling modes:
+#   "all"       - every decoded frame (original behaviour)
+#   "uniform"   - evenly spaced frames at BODY_LANGUAGE_FPS
+#   "keyframes" - only I-frames, decoded by ffmpeg
+#   "adaptive"  - like "uniform", but back off while the pose is stable
+# Defaults keep the original full-fidelity scoring; deployments opt into the faster modes
+BODY_LANGUAGE_MODE = os.getenv("BODY_LANGUAGE_MODE", "all")
+BODY_LANGUAGE_FPS = float(os.getenv("BODY_LANGUAGE_FPS", "10"))
+# Downscale frames wider than this before pose estimation; 0 keeps the source resolution
+BODY_LANGUAGE_MAX_WIDTH = int(os.getenv("BODY_LANGUAGE_MAX_WIDTH", "0"))
 
-    posture_score = 0
-    total_frames = 0
+# Adaptive mode: shoulder movement below this is "stable", and the stride can grow up to MAX_BACKOFF x
+STABLE_DELTA = 0.01
+MAX_BACKOFF = 8
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
 
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = pose.process(frame_rgb)
+def _downscale(frame: np.ndarray, max_width: Optional[int]) -> np.ndarray:
+    height, width = frame.shape[:2]
+    if not max_width or width <= max_width:
+        return frame
+    new_height = max(1, int(round(height * max_width / width)))
+    return cv2.resize(frame, (max_width, new_height), interpolation=cv2.INTER_AREA)
 
-        if result.pose_landmarks:
-            total_frames += 1
-            left_shoulder = result.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER]
-            right_shoulder = result.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER]
 
-            if abs(left_shoulder.y - right_shoulder.y) < 0.05:
-                posture_score += 1
+def _base_stride(fps: float, target_fps: Optional[float]) -> int:
+    if not target_fps or not fps or target_fps >= fps:
+        return 1
+    return max(1, int(round(fps / target_fps)))
 
-    cap.release()
-    pose.close()
 
-    if total_frames == 0:
-        return 50
+def _iter_sampled(frames: Union[FrameSource, Iterable[np.ndarray]], mode: str,
+                  target_fps: Optional[float], max_width: Optional[int],
+                  stats: Dict) -> Iterator[np.ndarray]:
+    """Yield the frames to analyze; stats["stride"] may be changed by the caller between frames"""
+    if mode == "keyframes" and isinstance(frames, FrameSource):
+        for frame in frames.keyframes(max_width):
+            stats["frames_decoded"] += 1
+            yield frame
+        return
 
-    percentage = (posture_score / total_frames) * 100
-    print(int(percentage), "ye dekh $$$$$$$$$$")
-    return int(percentage)
+    fps = frames.fps if isinstance(frames, FrameSource) else 0.0
+    stats["base_stride"] = stats["stride"] = 1 if mode == "all" else _base_stride(fps, target_fps)
 
+    if isinstance(frames, FrameSource):
+        # grab() skips frames without converting them, which is most of the decode cost
+        reader = frames.open()
+        try:
+            skip = 0
+            while True:
+                frame = reader.read(skip)
+                if frame is None:
+                    break
+                stats["frames_decoded"] = reader.position
+                yield _downscale(frame, max_width)
+                skip = stats["stride"] - 1
+        finally:
+            reader.close()
+        return
+
+    next_index = 0
+    for index, frame in enumerate(frames):
+        stats["frames_decoded"] = index + 1
+        if index < next_index:
+            continue
+        yield _downscale(frame, max_width)
+        next_index = index + stats["stride"]
+
+
+def analyze_body_language_stats(video_path: str, frames: Optional[Iterable[np.ndarray]] = None,
+                                mode: Optional[str] = None, target_fps: Optional[float] = None,
+                                max_width: Optional[int] = None,
+                                model_complexity: Optional[int] = None,
+                                track_path: Optional[str] = None) -> Dict:
+    """Posture metrics plus how many frames were decoded and actually run through MediaPipe"""
+    mode = mode or BODY_LANGUAGE_MODE
+    target_fps = BODY_LANGUAGE_FPS if target_fps is None else target_fps
+    max_width = BODY_LANGUAGE_MAX_WIDTH if max_width is None else max_width
+    if frames is None:
+        frames = FrameSource(video_path)
+
+    stats = {"frames_decoded": 0, "stride": 1, "base_stride": 1}
+    track = []
+    last_delta = None
+
+    # Graphs come from a per-process pool, so setup is paid once rather than per video
+    with get_pose_pool(model_complexity).checkout() as pose:
+        for frame in _iter_sampled(frames, mode, target_fps, max_width, stats):
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = pose.process(frame_rgb)
+
+            if not result.pose_landmarks:
+                track.append(empty_frame())
+                continue
+
+            landmarks = landmarks_to_array(result.pose_landmarks)
+            track.append(landmarks)
+
+            if mode == "adaptive":
+                delta = landmarks[LEFT_SHOULDER, 1] - landmarks[RIGHT_SHOULDER, 1]
+                if last_delta is not None and abs(delta - last_delta) < STABLE_DELTA:
+                    stats["stride"] = min(stats["stride"] * 2, stats["base_stride"] * MAX_BACKOFF)
+                else:
+                    stats["stride"] = stats["base_stride"]
+                last_delta = delta
+
+    # All scoring runs vectorized over the (frames, 33, 4) landmark track
+    track = stack_track(track)
+    if track_path:
+        save_track(track_path, track, fps=getattr(frames, "fps", 0.0))
+
+    metrics = score_track(track)
+    return {
+        **metrics,
+        "mode": mode,
+        "frames_decoded": stats["frames_decoded"],
+        "frames_processed": len(track),
+    }
+
+
+def analyze_body_language(video_path: str, frames: Optional[Iterable[np.ndarray]] = None, **sampling) -> int:
+    stats = analyze_body_language_stats(video_path, frames=frames, **sampling)
+    print(stats["score"], "ye dekh $$$$$$$$$$", f"({stats['frames_processed']}/{stats['frames_decoded']} frames)")
+    return stats["score"]
@@ -1,38 +1,83 @@
 from dotenv import load_dotenv
 import os
+from typing import AsyncIterator
 
 load_dotenv()  # MUST be called before os.getenv
 
 from groq import Groq
+from utils.llm_client import get_llm_client
+from utils.prompt_budget import GAP_MARKER, fit_transcript
 
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-def generate_feedback(transcript: str, speech_score: int, body_language_score: int) -> str:
-    if not transcript:
-        return "Error: Transcript is empty. Cannot generate feedback."
+SYSTEM_PROMPT = "You are a helpful assistant who gives feedback on presentations."
 
+
+def build_feedback_messages(transcript: str, speech_score: int, body_language_score: int) -> list:
+    # Long recordings are cut down to a fixed token budget so prompt size and latency stay bounded
+    excerpt = fit_transcript(transcript)
+    label = "Transcript" if excerpt is transcript else f"Transcript (excerpt, {GAP_MARKER} marks omitted passages)"
     prompt = f"""
 You are an expert communication coach. A user has given a presentation.
 
-Transcript:
-\"\"\"{transcript}\"\"\"
+{label}:
+\"\"\"{excerpt}\"\"\"
 
 Speech Score: {speech_score}/100
 Body Language Score: {body_language_score}/100
 
 Please give constructive, professional feedback in 4-5 sentences, including at least one strength and one area for improvement. Focus on both speech and body language.
 """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def generate_feedback(transcript: str, speech_score: int, body_language_score: int) -> str:
+    if not transcript:
+        return "Error: Transcript is empty. Cannot generate feedback."
 
     try:
         response = client.chat.completions.create(
             model="llama3-8b-8192",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant who gives feedback on presentations."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_feedback_messages(transcript, speech_score, body_language_score),
             max_tokens=300,
             temperature=0.7
         )
         return response.choices[0].message.content.strip()
     except Exception as e:
         return f"Error generating feedback: {str(e)}"
+
+
+async def generate_feedback_async(transcript: str, speech_score: int, body_language_score: int) -> str:
+    """Non-blocking variant for async handlers, using the shared pooled client"""
+    if not transcript:
+        return "Error: Transcript is empty. Cannot generate feedback."
+
+    try:
+        return await get_llm_client().chat(
+            build_feedback_messages(transcript, speech_score, body_language_score),
+            model="llama3-8b-8192",
+            max_tokens=300,
+            temperature=0.7,
+            cache_scope=f"{speech_score}:{body_language_score}"
+        )
+    except Exception as e:
+        return f"Error generating feedback: {str(e) or type(e).__name__}"
+
+
+async def stream_feedback(transcript: str, speech_score: int, body_language_score: int) -> AsyncIterator[str]:
+    """Yield feedback text as Groq produces it; the caller joins the pieces for the report"""
+    if not transcript:
+        yield "Error: Transcript is empty. Cannot generate feedback."
+        return
+
+    async for token in get_llm_client().stream_chat(
+        build_feedback_messages(transcript, speech_score, body_language_score),
+        model="llama3-8b-8192",
+        max_tokens=300,
+        temperature=0.7,
+        cache_scope=f"{speech_score}:{body_language_score}"
+    ):
+        yield token
@@ -0,0 +1,89 @@
+"""Local stand-in for the Groq chat completions API, for load tests and offline development.
+
+    python -m utils.groq_stub                      # http://localhost:8100
+    GROQ_BASE_URL=http://localhost:8100 uvicorn main:app
+
+STUB_LATENCY_SECONDS adds a delay to every response and STUB_FAILURE_RATE
+answers that fraction of requests with a 503, to exercise retries.
+Requests with "stream": true get the reply word by word as SSE chunks,
+STUB_TOKEN_SECONDS apart.
+"""
+import asyncio
+import os
+import random
+import time
+import json
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUB_PORT = int(os.getenv("STUB_PORT", "8100"))
+STUB_LATENCY_SECONDS = float(os.getenv("STUB_LATENCY_SECONDS", "0.5"))
+STUB_FAILURE_RATE = float(os.getenv("STUB_FAILURE_RATE", "0"))
+STUB_TOKEN_SECONDS = float(os.getenv("STUB_TOKEN_SECONDS", "0.02"))
+
+STUB_REPLY = (
+    "You spoke clearly and kept a steady pace throughout the presentation. "
+    "Your posture was upright and open, which made you come across as confident. "
+    "Try to reduce filler words when moving between points. "
+    "Using your hands a little more would help emphasize key ideas."
+)
+
+app = FastAPI(title="Groq API stub")
+
+
+async def _stream_chunks(completion_id: str, model: str):
+    def chunk(delta: dict, finish_reason=None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    for i, word in enumerate(STUB_REPLY.split(" ")):
+        await asyncio.sleep(STUB_TOKEN_SECONDS)
+        yield chunk({"content": word if i == 0 else " " + word})
+    yield chunk({}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(random.uniform(0.5, 1.5) * STUB_LATENCY_SECONDS)
+    if random.random() < STUB_FAILURE_RATE:
+        return JSONResponse(status_code=503, content={"error": {"message": "stub: service unavailable"}})
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    if body.get("stream"):
+        return StreamingResponse(_stream_chunks(completion_id, body.get("model", "stub")),
+                                 media_type="text/event-stream")
+
+    prompt_tokens = sum(len(str(m.get("content", ""))) // 4 for m in body.get("messages", []))
+    completion_tokens = len(STUB_REPLY) // 4
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": STUB_REPLY},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=STUB_PORT)
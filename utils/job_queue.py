@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+ProgressCallback = Callable[[str, str], None]
+JobHandler = Callable[..., Awaitable[Any]]
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at capacity and cannot accept another job"""
+
+
+class JobQueue:
+    """Bounded in-process job queue with a fixed pool of asyncio workers"""
+
+    def __init__(self, stages: List[str], max_workers: int = 2, max_pending: int = 16,
+                 results_dir: str = "temp/jobs", max_jobs_in_memory: int = 500,
+                 max_stored_jobs: int = 1000, retention_seconds: float = 24 * 3600):
+        self.stages = stages
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.results_dir = results_dir
+        self.max_jobs_in_memory = max_jobs_in_memory
+        self.max_stored_jobs = max_stored_jobs
+        self.retention_seconds = retention_seconds
+
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        os.makedirs(results_dir, exist_ok=True)
+
+    def start(self) -> None:
+        """Spawn the worker tasks; call from inside the running event loop"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def is_full(self) -> bool:
+        """True when submit() would be rejected; lets callers refuse work before accepting an upload"""
+        return self.pending >= self.max_pending
+
+    def submit(self, handler: JobHandler, *args, **kwargs) -> Dict:
+        """Queue handler(*args, progress=..., **kwargs); raises QueueFullError on backpressure"""
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        job = {
+            "job_id": job_id,
+            "status": QUEUED,
+            "progress": 0.0,
+            "stages": {stage: "pending" for stage in self.stages},
+            "created_at": now,
+            "updated_at": now,
+            "error": None,
+        }
+        self._jobs[job_id] = job
+        try:
+            self._queue.put_nowait((job_id, handler, args, kwargs))
+        except asyncio.QueueFull:
+            del self._jobs[job_id]
+            raise QueueFullError(f"Job queue is full ({self.max_pending} pending)")
+
+        self._prune()
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Current status of a job, falling back to the stored record on disk"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return {key: value for key, value in job.items() if key != "result"}
+        stored = self._load(job_id)
+        if stored is not None:
+            stored.pop("result", None)
+        return stored
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        """Full job record including the handler's result once it has finished"""
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else self._load(job_id)
+
+    def _progress_callback(self, job: Dict) -> ProgressCallback:
+        def progress(stage: str, status: str) -> None:
+            job["stages"][stage] = status
+            finished = sum(1 for value in job["stages"].values() if value == DONE)
+            job["progress"] = round(finished / len(job["stages"]), 3) if job["stages"] else 1.0
+            job["updated_at"] = time.time()
+        return progress
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, handler, args, kwargs = await self._queue.get()
+            job = self._jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                job["status"] = RUNNING
+                job["updated_at"] = time.time()
+                try:
+                    result = await handler(*args, progress=self._progress_callback(job), **kwargs)
+                    job["result"] = result
+                    job["status"] = DONE
+                    job["progress"] = 1.0
+                except Exception as e:
+                    print(f"❌ Job {job_id} failed:", e)
+                    job["status"] = FAILED
+                    job["error"] = str(e)
+                job["updated_at"] = time.time()
+                self._store(job)
+                self._evict_stored()
+            finally:
+                self._queue.task_done()
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.results_dir, f"{job_id}.json")
+
+    def _store(self, job: Dict) -> None:
+        try:
+            with open(self._path(job["job_id"]), "w", encoding="utf-8") as f:
+                json.dump(job, f)
+        except (OSError, TypeError) as e:
+            print(f"Could not store job {job['job_id']}: {e}")
+
+    def _evict_stored(self) -> None:
+        """Delete stored records older than retention_seconds, then the oldest beyond max_stored_jobs"""
+        try:
+            entries = []
+            with os.scandir(self.results_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        entries.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            return
+
+        entries.sort()
+        cutoff = time.time() - self.retention_seconds
+        excess = len(entries) - self.max_stored_jobs
+        for i, (mtime, path) in enumerate(entries):
+            if i >= excess and mtime >= cutoff:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _load(self, job_id: str) -> Optional[Dict]:
+        # Job IDs are hex UUIDs; anything else cannot name a stored result
+        if not job_id or not all(c in "0123456789abcdef" for c in job_id):
+            return None
+        try:
+            with open(self._path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs in memory; their records stay on disk"""
+        while len(self._jobs) > self.max_jobs_in_memory:
+            for job_id, job in self._jobs.items():
+                if job["status"] in (DONE, FAILED):
+                    del self._jobs[job_id]
+                    break
+            else:
+                break
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+try:
+    import numpy as np
+    from scipy.sparse import vstack
+    from sklearn.feature_extraction.text import HashingVectorizer
+except ImportError:
+    HashingVectorizer = None
+
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+# Cosine similarity above which a near-identical prompt reuses a cached answer; 0 means exact matches only
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so re-wrapped or re-indented copies of a prompt share a key"""
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+class LLMCache:
+    """In-memory LLM response cache: exact prompt-hash hits, optional similarity hits, TTL + LRU eviction.
+
+    llm_string identifies everything besides the prompt that shapes the answer (model,
+    sampling parameters, scope); entries are only reused within the same llm_string.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+                 similarity_threshold: float = LLM_CACHE_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold if HashingVectorizer is not None else 0
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._vectorizer = None
+        if self.similarity_threshold > 0:
+            self._vectorizer = HashingVectorizer(
+                n_features=2 ** 18, ngram_range=(1, 2), alternate_sign=False, norm="l2"
+            )
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry["created"] > self.ttl_seconds
+
+    def _similar(self, prompt: str, llm_string: str, now: float) -> Optional[str]:
+        candidates = [
+            key for key, entry in self._entries.items()
+            if entry["llm_string"] == llm_string and not self._expired(entry, now)
+        ]
+        if not candidates:
+            return None
+        query = self._vectorizer.transform([normalize_prompt(prompt)])
+        # One sparse product scores the prompt against every candidate at once
+        scores = (vstack([self._entries[key]["vector"] for key in candidates]) @ query.T).toarray().ravel()
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= self.similarity_threshold else None
+
+    def get(self, prompt: str, llm_string: str) -> Optional[Any]:
+        key = self.key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, now):
+                del self._entries[key]
+                entry = None
+            if entry is None and self._vectorizer is not None:
+                key = self._similar(prompt, llm_string, now)
+                entry = self._entries.get(key) if key else None
+                if entry is not None:
+                    self.similar_hits += 1
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def put(self, prompt: str, llm_string: str, value: Any) -> None:
+        key = self.key(prompt, llm_string)
+        vector = None
+        if self._vectorizer is not None:
+            vector = self._vectorizer.transform([normalize_prompt(prompt)])
+        with self._lock:
+            self._entries[key] = {
+                "value": value,
+                "llm_string": llm_string,
+                "vector": vector,
+                "created": time.time(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+            }
+
+
+try:
+    from langchain_core.caches import BaseCache
+except ImportError:
+    BaseCache = object
+
+
+class LangChainLLMCache(BaseCache):
+    """Adapter so LangChain models (e.g. ChatGroq in the summarize chain) share an LLMCache"""
+
+    def __init__(self, cache: LLMCache):
+        self.cache = cache
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence]:
+        return self.cache.get(prompt, llm_string)
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence) -> None:
+        self.cache.put(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear()
+
+
+_default_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache()
+    return _default_cache
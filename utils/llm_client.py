@@ -0,0 +1,188 @@
+import asyncio
+import os
+import random
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from groq import (
+    AsyncGroq, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+)
+
+from utils.llm_cache import get_llm_cache
+
+# Point GROQ_BASE_URL at utils.groq_stub to run without the real API
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
+LLM_MODEL = os.getenv("LLM_MODEL", "llama3-8b-8192")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 8.0
+
+RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError, asyncio.TimeoutError)
+
+
+def _cache_entry(messages: List[Dict], model: str, max_tokens: int, temperature: float,
+                 scope: Optional[str]):
+    prompt = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    llm_string = f"groq:{model}:{max_tokens}:{temperature}:{scope or ''}"
+    return prompt, llm_string
+
+
+class AsyncLLMClient:
+    """Shared async Groq client: pooled connections, deadlines, jittered retries, concurrency cap"""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = GROQ_BASE_URL,
+                 timeout: float = LLM_TIMEOUT_SECONDS, deadline: float = LLM_DEADLINE_SECONDS,
+                 max_retries: int = LLM_MAX_RETRIES, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        self.base_url = base_url
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self._client: Optional[AsyncGroq] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> AsyncGroq:
+        # Created lazily so the connection pool and semaphore belong to the running event loop
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                timeout=self.timeout,
+            )
+            # Retries are handled here so they share one deadline and the concurrency limit
+            self._client = AsyncGroq(
+                api_key=self.api_key, base_url=self.base_url, timeout=self.timeout,
+                max_retries=0, http_client=http_client
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def chat(self, messages: List[Dict], model: str = LLM_MODEL, max_tokens: int = 300,
+                   temperature: float = 0.7, deadline: Optional[float] = None,
+                   cache: bool = True, cache_scope: Optional[str] = None) -> str:
+        """One chat completion, retried with full-jitter backoff until the deadline.
+
+        Answers are cached per prompt; cache_scope keeps near-identical prompts that must
+        not share an answer (e.g. same transcript, different scores) apart.
+        """
+        if cache:
+            prompt, llm_string = _cache_entry(messages, model, max_tokens, temperature, cache_scope)
+            cached = get_llm_cache().get(prompt, llm_string)
+            if cached is not None:
+                return cached
+            text = await self.chat(messages, model, max_tokens, temperature, deadline, cache=False)
+            get_llm_cache().put(prompt, llm_string, text)
+            return text
+
+        client = self.client
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + (deadline or self.deadline)
+
+        attempt = 0
+        while True:
+            remaining = expires - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("LLM call exceeded its deadline")
+            try:
+                async with self._semaphore:
+                    response = await asyncio.wait_for(
+                        client.chat.completions.create(
+                            model=model, messages=messages, max_tokens=max_tokens, temperature=temperature
+                        ),
+                        timeout=min(self.timeout, remaining)
+                    )
+                return response.choices[0].message.content.strip()
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                backoff = random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt))
+                if loop.time() + backoff >= expires:
+                    raise
+                print(f"LLM call failed ({type(e).__name__}), retry {attempt} in {backoff:.2f}s")
+                await asyncio.sleep(backoff)
+
+    async def stream_chat(self, messages: List[Dict], model: str = LLM_MODEL, max_tokens: int = 300,
+                          temperature: float = 0.7, deadline: Optional[float] = None,
+                          cache: bool = True, cache_scope: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield completion text as it arrives; retried only until the first token is sent"""
+        if cache:
+            prompt, llm_string = _cache_entry(messages, model, max_tokens, temperature, cache_scope)
+            cached = get_llm_cache().get(prompt, llm_string)
+            if cached is not None:
+                yield cached
+                return
+            pieces = []
+            async for token in self.stream_chat(messages, model, max_tokens, temperature, deadline, cache=False):
+                pieces.append(token)
+                yield token
+            get_llm_cache().put(prompt, llm_string, "".join(pieces).strip())
+            return
+
+        client = self.client
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + (deadline or self.deadline)
+
+        attempt = 0
+        while True:
+            remaining = expires - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("LLM call exceeded its deadline")
+            started = False
+            try:
+                async with self._semaphore:
+                    stream = await asyncio.wait_for(
+                        client.chat.completions.create(
+                            model=model, messages=messages, max_tokens=max_tokens,
+                            temperature=temperature, stream=True
+                        ),
+                        timeout=min(self.timeout, remaining)
+                    )
+                    # Closing the stream returns its pooled connection, also when the deadline
+                    # hits or the consumer stops reading early
+                    async with stream:
+                        async for chunk in stream:
+                            if loop.time() > expires:
+                                raise asyncio.TimeoutError("LLM call exceeded its deadline")
+                            delta = chunk.choices[0].delta.content if chunk.choices else None
+                            if delta:
+                                started = True
+                                yield delta
+                return
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                # Tokens already forwarded cannot be taken back, so a broken stream is not retried
+                if started or attempt > self.max_retries:
+                    raise
+                backoff = random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt))
+                if loop.time() + backoff >= expires:
+                    raise
+                print(f"LLM stream failed ({type(e).__name__}), retry {attempt} in {backoff:.2f}s")
+                await asyncio.sleep(backoff)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+_default_client: Optional[AsyncLLMClient] = None
+
+
+def get_llm_client() -> AsyncLLMClient:
+    global _default_client
+    if _default_client is None:
+        _default_client = AsyncLLMClient()
+    return _default_client
@@ -0,0 +1,238 @@
+import os
+import subprocess
+import tempfile
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FFMPEG_PATH = os.getenv("FFMPEG_PATH", "ffmpeg")
+FFPROBE_PATH = os.getenv("FFPROBE_PATH", "ffprobe")
+
+# Recordings longer than this are spilled to a memory-mapped file instead of RAM
+MMAP_THRESHOLD_SECONDS = float(os.getenv("MEDIA_MMAP_THRESHOLD_SECONDS", "600"))
+
+READ_CHUNK_BYTES = 1 << 20
+
+
+def probe_duration(video_path: str) -> Optional[float]:
+    """Read the duration from container metadata without decoding; None if unavailable"""
+    cmd = [
+        FFPROBE_PATH, "-v", "error",
+        "-show_entries", "format=duration:stream=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        video_path
+    ]
+    try:
+        output = subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+    # Container duration first, stream durations as fallback; "N/A" when the muxer did not record one
+    for line in output.splitlines():
+        try:
+            duration = float(line.strip())
+        except ValueError:
+            continue
+        if duration > 0:
+            return duration
+    return None
+
+
+def iter_audio_blocks(video_path: str, sample_rate: int = SAMPLE_RATE,
+                      block_bytes: int = READ_CHUNK_BYTES) -> Iterator[np.ndarray]:
+    """Stream the audio track as mono float32 PCM blocks straight from an ffmpeg pipe"""
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    cmd = [
+        FFMPEG_PATH, "-nostdin", "-threads", "0", "-i", video_path,
+        "-vn", "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate),
+        "-"
+    ]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        raise FileNotFoundError("ffmpeg not found. Please install ffmpeg and add it to your PATH.")
+
+    pending = b""
+    completed = False
+    try:
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+            data = pending + data
+            usable = len(data) - (len(data) % 2)
+            pending = data[usable:]
+            yield np.frombuffer(data[:usable], np.int16).astype(np.float32) / 32768.0
+        completed = True
+    finally:
+        proc.stdout.close()
+        if not completed:
+            proc.kill()
+        returncode = proc.wait()
+
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode the audio (exit code {returncode})")
+
+
+def decode_audio_pcm(video_path: str, sample_rate: int = SAMPLE_RATE,
+                     mmap_path: Optional[str] = None) -> np.ndarray:
+    """Decode the audio track once into mono float32 PCM in [-1, 1]"""
+    if mmap_path:
+        with open(mmap_path, "wb") as sink:
+            for samples in iter_audio_blocks(video_path, sample_rate):
+                sink.write(samples.tobytes())
+        if os.path.getsize(mmap_path) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(mmap_path, dtype=np.float32, mode="r")
+
+    chunks = list(iter_audio_blocks(video_path, sample_rate))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+def iter_array_blocks(audio: np.ndarray, block_samples: int) -> Iterator[np.ndarray]:
+    """Fixed-size views over an in-memory or memory-mapped PCM buffer"""
+    for start in range(0, len(audio), block_samples):
+        yield np.asarray(audio[start:start + block_samples], dtype=np.float32)
+
+
+class FrameSource:
+    """Sequential BGR frame reader over a video file"""
+
+    def __init__(self, video_path: str):
+        import cv2
+        self.video_path = video_path
+        cap = cv2.VideoCapture(video_path)
+        try:
+            self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+            self.frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+            self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+            self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        finally:
+            cap.release()
+
+    def open(self) -> "FrameReader":
+        return FrameReader(self.video_path)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        reader = self.open()
+        try:
+            while True:
+                frame = reader.read()
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            reader.close()
+
+    def scaled_size(self, max_width: Optional[int]) -> Tuple[int, int]:
+        """Output (width, height) after limiting the width, keeping the aspect ratio even"""
+        if not max_width or not self.width or self.width <= max_width:
+            return self.width, self.height
+        height = int(round(self.height * max_width / self.width / 2)) * 2
+        return max_width, max(height, 2)
+
+    def keyframes(self, max_width: Optional[int] = None) -> Iterator[np.ndarray]:
+        """Decode only the keyframes (I-frames) through ffmpeg, optionally downscaled"""
+        width, height = self.scaled_size(max_width)
+        if not width or not height:
+            return
+        cmd = [
+            FFMPEG_PATH, "-nostdin", "-skip_frame", "nokey", "-i", self.video_path,
+            "-an", "-vsync", "0", "-vf", f"scale={width}:{height}",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-"
+        ]
+        frame_bytes = width * height * 3
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                data = proc.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    break
+                yield np.frombuffer(data, np.uint8).reshape(height, width, 3)
+        finally:
+            proc.stdout.close()
+            proc.kill()
+            proc.wait()
+
+
+class FrameReader:
+    """Frame-by-frame reader that can skip frames without decoding them to BGR"""
+
+    def __init__(self, video_path: str):
+        import cv2
+        self._cap = cv2.VideoCapture(video_path)
+        self.position = 0
+
+    def read(self, skip: int = 0) -> Optional[np.ndarray]:
+        """Skip `skip` frames, then return the next frame (None at end of stream)"""
+        for _ in range(skip):
+            if not self._cap.grab():
+                return None
+            self.position += 1
+        ret, frame = self._cap.read()
+        if not ret:
+            return None
+        self.position += 1
+        return frame
+
+    def close(self) -> None:
+        self._cap.release()
+
+
+class MediaBundle:
+    """Decoded media shared by every analyzer for one upload"""
+
+    def __init__(self, video_path: str, audio: np.ndarray, frames: FrameSource,
+                 sample_rate: int = SAMPLE_RATE, mmap_path: Optional[str] = None):
+        self.video_path = video_path
+        self.audio = audio
+        self.frames = frames
+        self.sample_rate = sample_rate
+        self._mmap_path = mmap_path
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / float(self.sample_rate)
+
+    def close(self) -> None:
+        """Release the PCM buffer and remove its backing file, if any"""
+        self.audio = np.zeros(0, dtype=np.float32)
+        if self._mmap_path and os.path.exists(self._mmap_path):
+            os.remove(self._mmap_path)
+        self._mmap_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def ingest_media(video_path: str, use_mmap: Optional[bool] = None) -> MediaBundle:
+    """Demux an upload once into a shared PCM buffer plus a frame source"""
+    frames = FrameSource(video_path)
+
+    if use_mmap is None:
+        expected = probe_duration(video_path)
+        if expected is None:
+            expected = frames.frame_count / frames.fps if frames.fps else 0
+        use_mmap = expected > MMAP_THRESHOLD_SECONDS
+
+    mmap_path = None
+    if use_mmap:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pcm") as tmp:
+            mmap_path = tmp.name
+
+    try:
+        audio = decode_audio_pcm(video_path, mmap_path=mmap_path)
+    except Exception:
+        if mmap_path and os.path.exists(mmap_path):
+            os.remove(mmap_path)
+        raise
+
+    return MediaBundle(video_path, audio, frames, mmap_path=mmap_path)
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+
+def _available_memory_bytes() -> Optional[int]:
+    """Return available physical memory in bytes, or None if unknown"""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _process_rss_bytes() -> int:
+    """Current resident set size of this process (Linux), 0 if unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def torch_model_bytes(model: Any) -> int:
+    """Approximate resident size of a torch module from its parameters and buffers"""
+    total = 0
+    for tensors in (getattr(model, "parameters", None), getattr(model, "buffers", None)):
+        if tensors is None:
+            continue
+        for tensor in tensors():
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def _key_name(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return ":".join(str(part) for part in key if part is not None)
+    return str(key)
+
+
+class ModelRegistry:
+    """Process-wide cache that loads each model once and shares it between requests"""
+
+    def __init__(self, loader: Callable[[Hashable], Any],
+                 memory_fn: Callable[[Any], int] = torch_model_bytes,
+                 idle_ttl: Optional[float] = None,
+                 max_resident_bytes: Optional[int] = None,
+                 min_free_bytes: Optional[int] = None):
+        self.loader = loader
+        self.memory_fn = memory_fn
+        self.idle_ttl = idle_ttl
+        self.max_resident_bytes = max_resident_bytes
+        self.min_free_bytes = min_free_bytes
+
+        self._models: Dict[Hashable, Any] = {}
+        self._stats: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: Hashable) -> Any:
+        """Return the model for key, loading it on first use"""
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                stats = self._stats[key]
+                stats["hits"] += 1
+                stats["last_used"] = time.time()
+                return model
+
+        # Per-key lock so concurrent first requests share a single load
+        with self._key_lock(key):
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._stats[key]["hits"] += 1
+                    self._stats[key]["last_used"] = time.time()
+                    return model
+
+            rss_before = _process_rss_bytes()
+            start = time.perf_counter()
+            model = self.loader(key)
+            load_time = time.perf_counter() - start
+            try:
+                resident = self.memory_fn(model)
+            except Exception:
+                resident = 0
+            # Engines that are not torch modules are measured by how much the process grew
+            if not resident:
+                resident = max(0, _process_rss_bytes() - rss_before)
+
+            now = time.time()
+            with self._lock:
+                self._models[key] = model
+                previous = self._stats.get(key, {})
+                self._stats[key] = {
+                    "load_time_seconds": round(load_time, 3),
+                    "loads": previous.get("loads", 0) + 1,
+                    "hits": previous.get("hits", 0),
+                    "resident_bytes": resident,
+                    "loaded_at": now,
+                    "last_used": now,
+                }
+            print(f"Loaded model {_key_name(key)} in {load_time:.2f}s ({resident / 1e6:.0f} MB)")
+
+        self.enforce_memory_limits(keep=key)
+        return model
+
+    def warmup(self, keys: Iterable[Hashable]) -> None:
+        """Load the given models ahead of the first request"""
+        for key in keys:
+            self.get(key)
+
+    def evict(self, key: Hashable) -> bool:
+        """Drop a loaded model so its memory can be reclaimed"""
+        with self._lock:
+            model = self._models.pop(key, None)
+            if key in self._stats:
+                self._stats[key]["resident_bytes"] = 0
+        if model is None:
+            return False
+        del model
+        print(f"Evicted model {_key_name(key)}")
+        return True
+
+    def evict_idle(self, max_idle_seconds: Optional[float] = None) -> int:
+        """Evict models that have not been used for max_idle_seconds"""
+        ttl = max_idle_seconds if max_idle_seconds is not None else self.idle_ttl
+        if ttl is None:
+            return 0
+        cutoff = time.time() - ttl
+        with self._lock:
+            idle = [key for key in self._models if self._stats[key]["last_used"] < cutoff]
+        return sum(self.evict(key) for key in idle)
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(self._stats[key]["resident_bytes"] for key in self._models)
+
+    def _under_pressure(self) -> bool:
+        if self.max_resident_bytes is not None and self.resident_bytes() > self.max_resident_bytes:
+            return True
+        if self.min_free_bytes is not None:
+            available = _available_memory_bytes()
+            if available is not None and available < self.min_free_bytes:
+                return True
+        return False
+
+    def enforce_memory_limits(self, keep: Optional[Hashable] = None) -> int:
+        """Evict least recently used models while over the configured memory limits"""
+        evicted = 0
+        while self._under_pressure():
+            with self._lock:
+                candidates = sorted(
+                    (key for key in self._models if key != keep),
+                    key=lambda k: self._stats[k]["last_used"]
+                )
+            if not candidates:
+                break
+            evicted += self.evict(candidates[0])
+        return evicted
+
+    def stats(self) -> Dict[str, Dict]:
+        """Load time, hit count and resident memory for every model seen so far"""
+        with self._lock:
+            return {
+                _key_name(key): dict(stats, loaded=key in self._models)
+                for key, stats in self._stats.items()
+            }
+
+
+def _env_megabytes(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(float(value) * 1024 * 1024) if value else None
+
+
+def _backend_bytes(backend: Any) -> int:
+    resident_bytes = getattr(backend, "resident_bytes", None)
+    return resident_bytes() if resident_bytes else 0
+
+
+def _load_transcription_backend(key):
+    from utils.transcription_backends import create_backend
+    backend, size, compute_type = key
+    return create_backend(backend, size, compute_type)
+
+
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "whisper")
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL", "base")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE") or None
+
+whisper_registry = ModelRegistry(
+    _load_transcription_backend,
+    memory_fn=_backend_bytes,
+    idle_ttl=float(os.getenv("WHISPER_IDLE_TTL", "0")) or None,
+    max_resident_bytes=_env_megabytes("WHISPER_MAX_RESIDENT_MB"),
+    min_free_bytes=_env_megabytes("WHISPER_MIN_FREE_MB"),
+)
+
+
+def get_transcription_backend(size: Optional[str] = None, backend: Optional[str] = None,
+                              compute_type: Optional[str] = None):
+    """Shared transcription backend (defaults to TRANSCRIBE_BACKEND / WHISPER_MODEL / WHISPER_COMPUTE_TYPE)"""
+    key = (backend or TRANSCRIBE_BACKEND, size or WHISPER_MODEL_SIZE, compute_type or WHISPER_COMPUTE_TYPE)
+    return whisper_registry.get(key)
+
+
+def warmup_whisper_models() -> List[str]:
+    """Load the model sizes listed in WHISPER_WARMUP (comma separated, "none" to skip)"""
+    value = os.getenv("WHISPER_WARMUP", WHISPER_MODEL_SIZE)
+    if value.strip().lower() in ("", "none", "false", "0"):
+        return []
+    sizes = [size.strip() for size in value.split(",") if size.strip()]
+    for size in sizes:
+        get_transcription_backend(size)
+    return sizes
@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.media_ingest import SAMPLE_RATE
+
+# Audio longer than this is split and transcribed across processes
+PARALLEL_MIN_SECONDS = float(os.getenv("PARALLEL_TRANSCRIBE_MIN_SECONDS", "600"))
+# Every worker loads its own Whisper model, so keep the default small
+TRANSCRIBE_PROCESSES = int(os.getenv("TRANSCRIBE_PROCESSES", str(min(2, os.cpu_count() or 1))))
+
+# Target window length, how far around each target to look for silence, and overlap between windows
+WINDOW_SECONDS = 300.0
+SEARCH_SECONDS = 20.0
+OVERLAP_SECONDS = 2.0
+FRAME_SAMPLES = 480
+SMOOTH_FRAMES = 16
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _init_worker(threads: int) -> None:
+    # Split the cores between workers instead of every process spawning one thread per core
+    try:
+        import torch
+        torch.set_num_threads(max(1, threads))
+    except ImportError:
+        pass
+
+
+def get_transcribe_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        threads = (os.cpu_count() or 1) // max(1, TRANSCRIBE_PROCESSES)
+        # Fork, not spawn: spawned workers re-run the `python main.py` entry point and build every
+        # service again. Forking is only safe while no other thread can hold a lock, which is
+        # why the server forks the workers up front in start_transcribe_pool
+        _pool = ProcessPoolExecutor(
+            max_workers=TRANSCRIBE_PROCESSES, initializer=_init_worker, initargs=(threads,),
+            mp_context=multiprocessing.get_context("fork")
+        )
+    return _pool
+
+
+def start_transcribe_pool() -> None:
+    """Fork every worker now; call at startup, before the server starts threads or loads models"""
+    if TRANSCRIBE_PROCESSES > 1:
+        # With fork the pool launches all of its workers on the first submit
+        get_transcribe_pool().submit(os.getpid).result()
+
+
+def shutdown_transcribe_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def find_split_points(audio: np.ndarray, window_seconds: float = WINDOW_SECONDS,
+                      search_seconds: float = SEARCH_SECONDS) -> List[int]:
+    """Sample offsets near every window_seconds that fall on the quietest stretch of audio"""
+    total = len(audio)
+    window = int(window_seconds * SAMPLE_RATE)
+    search = int(search_seconds * SAMPLE_RATE)
+    splits = [0]
+
+    target = window
+    while target < total - window // 4:
+        lo = max(splits[-1] + search, target - search)
+        hi = min(total, target + search)
+        region = np.asarray(audio[lo:hi], dtype=np.float32)
+        usable = len(region) - len(region) % FRAME_SAMPLES
+        if usable < FRAME_SAMPLES:
+            break
+        energy = np.square(region[:usable]).reshape(-1, FRAME_SAMPLES).mean(axis=1)
+        # Smooth over ~0.5 s so a single quiet frame inside a word does not win. "valid" skips the
+        # zero-padded ends, which would otherwise look quiet; entry i averages frames i..i+width-1
+        width = min(SMOOTH_FRAMES, len(energy))
+        smoothed = np.convolve(energy, np.ones(width) / width, mode="valid")
+        frame = int(np.argmin(smoothed)) + width // 2
+        split = lo + frame * FRAME_SAMPLES + FRAME_SAMPLES // 2
+        splits.append(split)
+        target = split + window
+
+    splits.append(total)
+    return splits
+
+
+def _transcribe_window(chunk: np.ndarray, offset: float) -> Dict:
+    from utils.model_registry import get_transcription_backend
+    result = get_transcription_backend().transcribe(chunk)
+    return {
+        "language": result["language"],
+        "segments": [dict(seg, start=offset + seg["start"], end=offset + seg["end"]) for seg in result["segments"]]
+    }
+
+
+def _stitch(windows: List[Dict], owned: List[Tuple[float, float]]) -> List[Dict]:
+    """Keep each segment only in the window that owns its midpoint, then drop repeated text"""
+    segments = []
+    for result, (own_start, own_end) in zip(windows, owned):
+        for seg in result["segments"]:
+            middle = (seg["start"] + seg["end"]) / 2
+            if own_start <= middle < own_end:
+                segments.append(seg)
+
+    stitched = []
+    for seg in segments:
+        if stitched and seg["text"] == stitched[-1]["text"] and seg["start"] < stitched[-1]["end"] + OVERLAP_SECONDS:
+            stitched[-1]["end"] = max(stitched[-1]["end"], seg["end"])
+            continue
+        if stitched and seg["start"] < stitched[-1]["end"]:
+            seg = dict(seg, start=stitched[-1]["end"])
+        stitched.append(seg)
+    return stitched
+
+
+def transcribe_parallel(audio: np.ndarray) -> Dict:
+    """Transcribe long audio as overlapping silence-aligned windows across a process pool"""
+    splits = find_split_points(audio)
+    overlap = int(OVERLAP_SECONDS * SAMPLE_RATE)
+    pool = get_transcribe_pool()
+
+    futures = []
+    owned = []
+    for start, end in zip(splits[:-1], splits[1:]):
+        lo = max(0, start - overlap)
+        hi = min(len(audio), end + overlap)
+        chunk = np.ascontiguousarray(audio[lo:hi], dtype=np.float32)
+        futures.append(pool.submit(_transcribe_window, chunk, lo / float(SAMPLE_RATE)))
+        owned.append((start / float(SAMPLE_RATE), end / float(SAMPLE_RATE)))
+    # Whisper can place the final timestamp slightly past the end of the audio
+    owned[-1] = (owned[-1][0], float("inf"))
+
+    windows = [future.result() for future in futures]
+    segments = _stitch(windows, owned)
+    languages = [w["language"] for w in windows if w["language"]]
+    return {
+        "text": " ".join(seg["text"] for seg in segments).strip(),
+        "segments": segments,
+        "language": max(set(languages), key=languages.count) if languages else None,
+    }
@@ -1,27 +1,30 @@
+import asyncio
 import os
-import fitz  # PyMuPDF
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-from tempfile import NamedTemporaryFile
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
 from dotenv import load_dotenv
 
-from langchain.text_splitter import CharacterTextSplitter
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_groq import ChatGroq
-from langchain.chains.summarize import load_summarize_chain
+
+from utils.pdf_text import iter_pdf_chunks
+from utils.prompt_budget import count_tokens
+from utils.sse import iterate_in_thread
 
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    raise ValueError("GROQ_API_KEY environment variable not set")
-
-llm = ChatGroq(
-    groq_api_key=GROQ_API_KEY,
-    model_name="llama3-8b-8192"
-)
-
-app = FastAPI()
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "llama3-8b-8192")
+SUMMARY_CHUNK_TOKENS = 1500
+SUMMARY_CHUNK_OVERLAP = 200
+# Concurrent Groq calls per summary, and how much summary text one reduce call may combine
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "8"))
+SUMMARY_REDUCE_TOKENS = int(os.getenv("SUMMARY_REDUCE_TOKENS", "3000"))
 
 SUMMARY_PROMPT = PromptTemplate.from_template("""
 Summarize the following content clearly and concisely:
@@ -31,45 +34,147 @@ Summarize the following content clearly and concisely:
 Summary:
 """)
 
-def PDFSummarizer(file: UploadFile) -> str:
-    if not file.filename.endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed.")
-
-    # Save uploaded PDF temporarily
-    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(file.file.read())
-        tmp_path = tmp.name
 
+class EmptyPDFError(Exception):
+    """Raised when a PDF has no extractable text to summarize"""
+
+
+class PDFSummarizer:
+    """Summarization service owned by the app.
+
+    The ChatGroq client, its HTTP connection pools, the tiktoken-backed splitter and the
+    summarize chain are built once on first use and shared by every request.
+    """
+
+    def __init__(self, model_name: str = SUMMARY_MODEL, chunk_size: int = SUMMARY_CHUNK_TOKENS,
+                 chunk_overlap: int = SUMMARY_CHUNK_OVERLAP, max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+                 reduce_tokens: int = SUMMARY_REDUCE_TOKENS):
+        self.model_name = model_name
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.max_concurrency = max_concurrency
+        self.reduce_tokens = reduce_tokens
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._llm: Optional[ChatGroq] = None
+        self._splitter: Optional[RecursiveCharacterTextSplitter] = None
+        self._chain = None
+
+    @property
+    def llm(self) -> ChatGroq:
+        with self._lock:
+            if self._llm is None:
+                if not GROQ_API_KEY:
+                    raise ValueError("GROQ_API_KEY environment variable not set")
+                self._http_client = httpx.Client()
+                self._http_async_client = httpx.AsyncClient()
+                self._llm = ChatGroq(
+                    groq_api_key=GROQ_API_KEY,
+                    model_name=self.model_name,
+                    http_client=self._http_client,
+                    http_async_client=self._http_async_client,
+                    cache=_summary_cache(),
+                )
+            return self._llm
+
+    @property
+    def splitter(self) -> RecursiveCharacterTextSplitter:
+        # from_tiktoken_encoder loads the BPE ranks; keeping the splitter keeps the encoder
+        with self._lock:
+            if self._splitter is None:
+                self._splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+                    chunk_size=self.chunk_size,
+                    chunk_overlap=self.chunk_overlap
+                )
+            return self._splitter
+
+    @property
+    def chain(self):
+        llm = self.llm
+        with self._lock:
+            if self._chain is None:
+                self._chain = SUMMARY_PROMPT | llm | StrOutputParser()
+            return self._chain
+
+    async def _summarize_chunk(self, text: str, semaphore: asyncio.Semaphore) -> Dict:
+        async with semaphore:
+            start = time.perf_counter()
+            summary = await self.chain.ainvoke({"text": text})
+            return {"summary": summary.strip(), "seconds": round(time.perf_counter() - start, 3)}
+
+    def _reduce_batches(self, summaries: List[str]) -> List[List[str]]:
+        """Group consecutive summaries so each reduce call stays within reduce_tokens"""
+        batches = [[]]
+        used = 0
+        for summary in summaries:
+            tokens = count_tokens(summary)
+            if batches[-1] and used + tokens > self.reduce_tokens:
+                batches.append([])
+                used = 0
+            batches[-1].append(summary)
+            used += tokens
+        return batches
+
+    async def _map_reduce(self, chunks: AsyncIterator[str]) -> Dict:
+        """Map every chunk concurrently, then reduce the summaries level by level until one is left"""
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Map calls start as soon as each chunk is split off, while later pages are still being read
+        tasks = []
+        try:
+            async for chunk in chunks:
+                tasks.append(asyncio.ensure_future(self._summarize_chunk(chunk, semaphore)))
+            if not tasks:
+                raise EmptyPDFError("No readable text found in PDF.")
+            mapped = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        map_seconds = time.perf_counter() - started
+        for i, chunk in enumerate(mapped):
+            print(f"Summary chunk {i + 1}/{len(mapped)}: {chunk['seconds']:.2f}s")
+
+        summaries = [chunk["summary"] for chunk in mapped]
+        levels = 0
+        # Always combine at least once so a single-chunk document gets the same final pass
+        while len(summaries) > 1 or levels == 0:
+            batches = self._reduce_batches(summaries)
+            if len(batches) == len(summaries) > 1:
+                # Every summary alone fills the budget; merge pairwise so the loop still converges
+                batches = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+            reduced = await asyncio.gather(
+                *(self._summarize_chunk("\n\n".join(batch), semaphore) for batch in batches)
+            )
+            summaries = [chunk["summary"] for chunk in reduced]
+            levels += 1
+
+        return {
+            "summary": summaries[0],
+            "chunks": len(mapped),
+            "chunk_seconds": [chunk["seconds"] for chunk in mapped],
+            "map_seconds": round(map_seconds, 3),
+            "reduce_levels": levels,
+            "total_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    async def asummarize_pdf(self, data: bytes) -> Dict:
+        # Pages are extracted and split on a worker thread, one window at a time
+        return await self._map_reduce(iterate_in_thread(iter_pdf_chunks, data, self.splitter))
+
+    async def aclose(self) -> None:
+        if self._http_async_client is not None:
+            await self._http_async_client.aclose()
+        if self._http_client is not None:
+            self._http_client.close()
+
+
+def _summary_cache():
+    # Repeated chunks (same lecture PDF, template resumes) are answered from the shared LLM cache
     try:
-        # Extract text from PDF using PyMuPDF
-        text = ""
-        with fitz.open(tmp_path) as doc:
-            for page in doc:
-                text += page.get_text()
-
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="No readable text found in PDF.")
-
-        # Split large text into chunks
-        splitter = CharacterTextSplitter.from_tiktoken_encoder(
-            chunk_size=1500,
-            chunk_overlap=200
-        )
-        docs = splitter.create_documents([text])
-
-        # Create summarization chain
-        chain = load_summarize_chain(
-            llm=llm,
-            chain_type="map_reduce",
-            map_prompt=SUMMARY_PROMPT,
-            combine_prompt=SUMMARY_PROMPT
-        )
-
-        summary = chain.run(docs)
-        return summary.strip()
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    finally:
-        os.remove(tmp_path)
\ No newline at end of file
+        from utils.llm_cache import LangChainLLMCache, get_llm_cache
+        return LangChainLLMCache(get_llm_cache())
+    except Exception:
+        return None
@@ -0,0 +1,181 @@
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional
+
+import fitz  # PyMuPDF
+
+# How much page text to gather before running the splitter; roughly a dozen 1500-token chunks
+SPLIT_WINDOW_CHARS = 64_000
+
+# Documents with at least this many pages are extracted in page ranges across processes
+PARALLEL_PDF_MIN_PAGES = int(os.getenv("PARALLEL_PDF_MIN_PAGES", "64"))
+# Kept small: the pool stays alive next to the transcription workers for the server's lifetime
+PDF_EXTRACT_PROCESSES = int(os.getenv("PDF_EXTRACT_PROCESSES", str(min(4, os.cpu_count() or 1))))
+# More ranges than workers so one slow, image-heavy range does not hold up the rest
+RANGES_PER_PROCESS = 4
+
+# Extracted text kept per document hash; resumes are small and get rescored against many jobs
+PDF_TEXT_CACHE_ENTRIES = int(os.getenv("PDF_TEXT_CACHE_ENTRIES", "256"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_text_cache: "OrderedDict[str, str]" = OrderedDict()
+_text_cache_lock = threading.Lock()
+
+# Worker-side: the document the last range came from, kept open for the next range of it
+_worker_doc = None
+_worker_doc_path: Optional[str] = None
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Fork, forked up front by start_pdf_pool (see get_transcribe_pool)
+        _pool = ProcessPoolExecutor(
+            max_workers=PDF_EXTRACT_PROCESSES, mp_context=multiprocessing.get_context("fork")
+        )
+    return _pool
+
+
+def start_pdf_pool() -> None:
+    """Fork every worker now; call at startup, before the server starts threads"""
+    if PDF_EXTRACT_PROCESSES > 1:
+        get_pdf_pool().submit(os.getpid).result()
+
+
+def shutdown_pdf_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    # fitz documents cannot cross processes, so each worker opens the file once and keeps it
+    # open for its remaining ranges instead of re-parsing the document per range
+    global _worker_doc, _worker_doc_path
+    if _worker_doc_path != path:
+        if _worker_doc is not None:
+            _worker_doc.close()
+        _worker_doc = fitz.open(path)
+        _worker_doc_path = path
+    return [_worker_doc[i].get_text() for i in range(start, stop)]
+
+
+def page_ranges(page_count: int, parts: int) -> List[range]:
+    """Split [0, page_count) into at most `parts` contiguous, near-equal ranges"""
+    parts = max(1, min(parts, page_count))
+    bounds = [page_count * i // parts for i in range(parts + 1)]
+    return [range(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+def iter_pdf_pages_parallel(data: bytes, processes: int = PDF_EXTRACT_PROCESSES) -> Iterator[str]:
+    """Page text in document order, with page ranges extracted concurrently on a process pool"""
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+
+    # Workers read the document from one temp file; only its path crosses the process boundary
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    futures = []
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        pool = get_pdf_pool()
+        futures = [
+            pool.submit(_extract_page_range, path, pages.start, pages.stop)
+            for pages in page_ranges(page_count, processes * RANGES_PER_PROCESS)
+        ]
+        # Waiting on futures in submission order merges the ranges back in page order
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        # Ranges already running still need the file
+        wait(futures)
+        os.remove(path)
+
+
+def iter_pdf_pages(data: bytes, parallel: Optional[bool] = None) -> Iterator[str]:
+    """Yield the text of each page, read straight from the uploaded bytes.
+
+    Large documents go through iter_pdf_pages_parallel unless parallel is False.
+    """
+    if parallel is None:
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            parallel = PDF_EXTRACT_PROCESSES > 1 and doc.page_count >= PARALLEL_PDF_MIN_PAGES
+    if parallel:
+        yield from iter_pdf_pages_parallel(data)
+        return
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for page in doc:
+            yield page.get_text()
+
+
+def extract_pdf_text(data: bytes, parallel: Optional[bool] = None) -> str:
+    return "".join(iter_pdf_pages(data, parallel))
+
+
+def extract_pdf_text_cached(data: bytes) -> str:
+    """extract_pdf_text memoized on the SHA-256 of the document bytes (LRU)"""
+    key = hashlib.sha256(data).hexdigest()
+    with _text_cache_lock:
+        text = _text_cache.get(key)
+        if text is not None:
+            _text_cache.move_to_end(key)
+            return text
+
+    text = extract_pdf_text(data)
+    with _text_cache_lock:
+        _text_cache[key] = text
+        while len(_text_cache) > PDF_TEXT_CACHE_ENTRIES:
+            _text_cache.popitem(last=False)
+    return text
+
+
+def _unsplit_tail(text: str, last_chunk: str) -> str:
+    """Raw text from where the last chunk starts, so re-splitting it with more pages is exact"""
+    start = text.rfind(last_chunk)
+    # The splitter can normalise separators inside a chunk; then fall back to the chunk itself
+    return text[start:] if start >= 0 else last_chunk + "\n"
+
+
+def iter_text_chunks(pages: Iterable[str], splitter, window_chars: int = SPLIT_WINDOW_CHARS) -> Iterator[str]:
+    """Split page text into chunks as pages arrive instead of splitting one giant string.
+
+    The splitter runs once per window_chars of new text. The last chunk of each window is
+    carried into the next one, so chunk boundaries and overlap normally come out as if the
+    whole document had been split at once; a tail longer than a window is emitted rather
+    than carried, which keeps the total splitting work linear in the document size.
+    """
+    buffer = []
+    new_chars = 0
+    for page in pages:
+        buffer.append(page)
+        new_chars += len(page)
+        if new_chars < window_chars:
+            continue
+        text = "".join(buffer)
+        chunks = splitter.split_text(text)
+        buffer = []
+        new_chars = 0
+        if not chunks:
+            continue
+        yield from chunks[:-1]
+        tail = _unsplit_tail(text, chunks[-1])
+        if len(tail) > window_chars:
+            yield chunks[-1]
+        else:
+            buffer = [tail]
+
+    if buffer:
+        yield from splitter.split_text("".join(buffer))
+
+
+def iter_pdf_chunks(data: bytes, splitter) -> Iterator[str]:
+    return iter_text_chunks(iter_pdf_pages(data), splitter)
@@ -0,0 +1,102 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import mediapipe as mp
+
+POSE_POOL_SIZE = int(os.getenv("POSE_POOL_SIZE", os.getenv("ANALYSIS_WORKERS", "3")))
+POSE_MODEL_COMPLEXITY = int(os.getenv("POSE_MODEL_COMPLEXITY", "1"))
+
+
+class PosePool:
+    """Pre-initialized MediaPipe Pose graphs that requests check out and return"""
+
+    def __init__(self, model_complexity: int = POSE_MODEL_COMPLEXITY, size: int = POSE_POOL_SIZE):
+        self.model_complexity = model_complexity
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create(self):
+        return mp.solutions.pose.Pose(model_complexity=self.model_complexity)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._create()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        # Every graph is busy: wait for one to come back
+        return self._idle.get()
+
+    def _release(self, pose) -> None:
+        # Clear tracking state so the next video does not start from this one's landmarks
+        try:
+            pose.reset()
+        except Exception:
+            pose.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(pose)
+
+    @contextmanager
+    def checkout(self) -> Iterator:
+        pose = self._acquire()
+        try:
+            yield pose
+        finally:
+            self._release(pose)
+
+    def warmup(self) -> int:
+        """Create every graph up front so the first requests skip setup"""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    return self._created
+                self._created += 1
+            try:
+                self._idle.put(self._create())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+    def close(self) -> None:
+        while True:
+            try:
+                pose = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            pose.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pools: Dict[int, PosePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pose_pool(model_complexity: Optional[int] = None) -> PosePool:
+    """Process-wide pool for the given model_complexity (defaults to POSE_MODEL_COMPLEXITY)"""
+    complexity = POSE_MODEL_COMPLEXITY if model_complexity is None else model_complexity
+    with _pools_lock:
+        pool = _pools.get(complexity)
+        if pool is None:
+            pool = _pools[complexity] = PosePool(model_complexity=complexity)
+        return pool
@@ -0,0 +1,103 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# MediaPipe Pose landmark indices
+NOSE = 0
+LEFT_EAR, RIGHT_EAR = 7, 8
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+NUM_LANDMARKS = 33
+
+# Channels of the last axis: x, y, z, visibility
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+
+SHOULDER_LEVEL_THRESHOLD = 0.05
+VISIBLE_THRESHOLD = 0.5
+
+
+def landmarks_to_array(pose_landmarks) -> np.ndarray:
+    """Flatten one frame of MediaPipe landmarks into a (33, 4) float32 array"""
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark],
+        dtype=np.float32
+    )
+
+
+def empty_frame() -> np.ndarray:
+    """Placeholder row for frames where no pose was detected"""
+    return np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+
+
+def stack_track(frames: Iterable[np.ndarray]) -> np.ndarray:
+    """Stack per-frame arrays into a (frames, 33, 4) track"""
+    frames = list(frames)
+    if not frames:
+        return np.zeros((0, NUM_LANDMARKS, 4), dtype=np.float32)
+    return np.stack(frames).astype(np.float32, copy=False)
+
+
+def save_track(path: str, track: np.ndarray, fps: float = 0.0) -> None:
+    """Cache a landmark track so it can be re-scored without re-running pose estimation"""
+    np.savez_compressed(path, track=track, fps=np.float32(fps))
+
+
+def load_track(path: str):
+    with np.load(path) as data:
+        return data["track"], float(data["fps"])
+
+
+def score_track(track: np.ndarray) -> Dict:
+    """Vectorized posture metrics over a (frames, 33, 4) landmark track"""
+    detected = ~np.isnan(track[:, NOSE, X]) if len(track) else np.zeros(0, dtype=bool)
+    poses = track[detected]
+    frames_with_pose = int(len(poses))
+
+    if frames_with_pose == 0:
+        return {
+            "score": 50,
+            "frames_with_pose": 0,
+            "shoulder_level_ratio": None,
+            "head_tilt_degrees": None,
+            "fidget_variance": None,
+            "hand_visibility_ratio": None,
+        }
+
+    shoulder_dy = np.abs(poses[:, LEFT_SHOULDER, Y] - poses[:, RIGHT_SHOULDER, Y])
+    level_ratio = float(np.mean(shoulder_dy < SHOULDER_LEVEL_THRESHOLD))
+
+    ear_dx = poses[:, LEFT_EAR, X] - poses[:, RIGHT_EAR, X]
+    ear_dy = poses[:, LEFT_EAR, Y] - poses[:, RIGHT_EAR, Y]
+    tilt = np.degrees(np.arctan2(np.abs(ear_dy), np.abs(ear_dx)))
+
+    # Frame-to-frame wrist movement, normalized by shoulder width so distance to camera cancels out
+    wrists = poses[:, [LEFT_WRIST, RIGHT_WRIST], :2]
+    shoulder_width = np.linalg.norm(
+        poses[:, LEFT_SHOULDER, :2] - poses[:, RIGHT_SHOULDER, :2], axis=1
+    )
+    shoulder_width = np.where(shoulder_width > 1e-6, shoulder_width, np.nan)
+    if frames_with_pose > 1:
+        movement = np.linalg.norm(np.diff(wrists, axis=0), axis=2) / shoulder_width[1:, None]
+        fidget_variance = float(np.nanvar(movement)) if np.isfinite(movement).any() else 0.0
+    else:
+        fidget_variance = 0.0
+
+    hands_visible = (poses[:, [LEFT_WRIST, RIGHT_WRIST], VISIBILITY] > VISIBLE_THRESHOLD).any(axis=1)
+
+    return {
+        "score": int(level_ratio * 100),
+        "frames_with_pose": frames_with_pose,
+        "shoulder_level_ratio": round(level_ratio, 4),
+        "head_tilt_degrees": round(float(np.mean(tilt)), 2),
+        "fidget_variance": round(fidget_variance, 6),
+        "hand_visibility_ratio": round(float(np.mean(hands_visible)), 4),
+    }
+
+
+def rescore_cached_track(path: str) -> Optional[Dict]:
+    """Score a previously cached track, or None if it cannot be read"""
+    try:
+        track, _ = load_track(path)
+    except (OSError, KeyError, ValueError):
+        return None
+    return score_track(track)
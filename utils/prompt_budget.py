@@ -0,0 +1,114 @@
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import List
+
+# llama3-8b-8192 has an 8k context; the transcript gets what is left after instructions and the reply
+FEEDBACK_TRANSCRIPT_TOKENS = int(os.getenv("FEEDBACK_TRANSCRIPT_TOKENS", "3000"))
+
+# Share of the budget always spent on the opening and closing of the talk
+HEAD_SHARE = 0.2
+TAIL_SHARE = 0.15
+GAP_MARKER = "[...]"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z']+")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        # Not llama3's own tokenizer, but close enough for budgeting
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        # Roughly four characters per token for English text
+        return (len(text) + 3) // 4
+    return len(encoding.encode_ordinary(text))
+
+
+def _count_many(texts: List[str]) -> List[int]:
+    encoding = _encoding()
+    if encoding is None:
+        return [(len(text) + 3) // 4 for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+
+def split_sentences(text: str) -> List[str]:
+    # Whisper output is punctuated; fall back to fixed word runs if it is not
+    sentences = [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+    if len(sentences) <= 1:
+        words = text.split()
+        sentences = [" ".join(words[i:i + 25]) for i in range(0, len(words), 25)]
+    return sentences
+
+
+def _score_sentences(sentences: List[str]) -> List[float]:
+    """Average document frequency of a sentence's content words; favours on-topic sentences"""
+    tokenized = [[w for w in _WORD.findall(s.lower()) if len(w) > 3] for s in sentences]
+    frequencies = Counter(w for words in tokenized for w in words)
+    top = max(frequencies.values(), default=1)
+    return [
+        sum(frequencies[w] for w in words) / (top * len(words)) if words else 0.0
+        for words in tokenized
+    ]
+
+
+def fit_transcript(transcript: str, max_tokens: int = FEEDBACK_TRANSCRIPT_TOKENS) -> str:
+    """Return the transcript unchanged if it fits, otherwise an extractive excerpt within max_tokens.
+
+    The excerpt keeps the opening and closing of the talk plus the highest-scoring sentences
+    in between, in their original order, with GAP_MARKER where text was left out.
+    """
+    if count_tokens(transcript) <= max_tokens:
+        return transcript
+
+    sentences = split_sentences(transcript)
+    costs = _count_many(sentences)
+    marker_cost = count_tokens(GAP_MARKER) + 1
+    chosen = set()
+    used = 0
+
+    def take(index: int) -> bool:
+        nonlocal used
+        cost = costs[index] + marker_cost
+        if used + cost > max_tokens:
+            return False
+        chosen.add(index)
+        used += cost
+        return True
+
+    head_budget = max_tokens * HEAD_SHARE
+    for i in range(len(sentences)):
+        if used >= head_budget or not take(i):
+            break
+
+    tail_budget = used + max_tokens * TAIL_SHARE
+    tail = []
+    for i in range(len(sentences) - 1, -1, -1):
+        if i in chosen or used >= tail_budget or not take(i):
+            break
+        tail.append(i)
+
+    scores = _score_sentences(sentences)
+    for i in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+        if i not in chosen:
+            take(i)
+
+    parts = []
+    previous = -1
+    for i in sorted(chosen):
+        if i != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(sentences[i])
+        previous = i
+    if previous != len(sentences) - 1:
+        parts.append(GAP_MARKER)
+    return " ".join(parts)
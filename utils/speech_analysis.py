@@ -1,33 +1,200 @@
-import subprocess
-import os
-import tempfile
-import wave
-import contextlib
-
-def analyze_speech(video_path: str) -> int:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-        temp_wav = temp_audio.name
-
-    subprocess.call([
-        "ffmpeg", "-y", "-i", video_path,
-        "-ac", "1", "-ar", "16000",
-        temp_wav
-    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-    with contextlib.closing(wave.open(temp_wav, 'r')) as f:
-        frames = f.getnframes()
-        rate = f.getframerate()
-        duration = frames / float(rate)
+import re
+from typing import Dict, Iterable, Optional, Union
+import numpy as np
+from utils.media_ingest import SAMPLE_RATE, iter_array_blocks, iter_audio_blocks
 
+# 30 ms analysis frames, streamed in 3 s blocks so memory stays flat for long recordings
+FRAME_SAMPLES = 480
+BLOCK_SAMPLES = FRAME_SAMPLES * 100
+
+# Silence must last this long to count as a pause rather than a gap between words
+MIN_PAUSE_SECONDS = 0.3
+# Voice activity threshold: this far above the tracked noise floor, never below the absolute floor
+VAD_MARGIN_DB = 12.0
+VAD_ABSOLUTE_FLOOR_DB = -50.0
+# A block's quiet frames above this are speech, not noise (e.g. a recording that opens mid-sentence)
+NOISE_FLOOR_CEILING_DB = -40.0
+NOISE_FLOOR_RISE_DB = 0.5
+
+# Only unambiguous hesitation sounds; words like "like" or "actually" are usually meant
+FILLER_WORDS = {"um", "umm", "uh", "uhh", "uhm", "er", "erm", "ah", "hmm"}
+
+
+class _AcousticTracker:
+    """Streaming voice activity, pause and loudness statistics over fixed-size PCM blocks"""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.min_pause_frames = int(MIN_PAUSE_SECONDS * sample_rate / FRAME_SAMPLES)
+        self.total_samples = 0
+        self.total_frames = 0
+        self.voiced_frames = 0
+        self.pause_frames = 0
+        self.pause_count = 0
+        self.noise_floor = None
+        self._silent_run = 0
+        self._seen_voice = False
+        self._carry = np.zeros(0, dtype=np.float32)
+        # Running mean / M2 of voiced-frame loudness (Chan's parallel variance update)
+        self._loud_n = 0
+        self._loud_mean = 0.0
+        self._loud_m2 = 0.0
+
+    def update(self, block: np.ndarray) -> None:
+        self.total_samples += len(block)
+        samples = np.concatenate((self._carry, block)) if len(self._carry) else block
+        usable = len(samples) - len(samples) % FRAME_SAMPLES
+        self._carry = samples[usable:].copy()
+        if usable == 0:
+            return
+
+        frames = samples[:usable].reshape(-1, FRAME_SAMPLES)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        db = 20.0 * np.log10(rms + 1e-10)
+
+        block_floor = min(float(np.percentile(db, 10)), NOISE_FLOOR_CEILING_DB)
+        if self.noise_floor is None:
+            self.noise_floor = block_floor
+        else:
+            self.noise_floor = min(block_floor, self.noise_floor + NOISE_FLOOR_RISE_DB)
+        threshold = max(self.noise_floor + VAD_MARGIN_DB, VAD_ABSOLUTE_FLOOR_DB)
+        voiced = db > threshold
+
+        self.total_frames += len(db)
+        self.voiced_frames += int(voiced.sum())
+        self._update_loudness(db[voiced])
+        self._update_pauses(voiced)
+
+    def _update_loudness(self, values: np.ndarray) -> None:
+        n = len(values)
+        if n == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self._loud_n + n
+        delta = mean - self._loud_mean
+        self._loud_mean += delta * n / total
+        self._loud_m2 += m2 + delta * delta * self._loud_n * n / total
+        self._loud_n = total
+
+    def _update_pauses(self, voiced: np.ndarray) -> None:
+        # Walk runs of equal values rather than individual frames
+        changes = np.flatnonzero(np.diff(voiced.astype(np.int8))) + 1
+        bounds = np.concatenate(([0], changes, [len(voiced)]))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if voiced[start]:
+                if self._seen_voice and self._silent_run >= self.min_pause_frames:
+                    self.pause_frames += self._silent_run
+                    self.pause_count += 1
+                self._silent_run = 0
+                self._seen_voice = True
+            else:
+                self._silent_run += int(end - start)
+
+    def result(self) -> Dict:
+        # Trailing silence after the last word is not a pause
+        duration = self.total_samples / float(self.sample_rate)
+        frame_seconds = FRAME_SAMPLES / float(self.sample_rate)
+        loudness_variance = self._loud_m2 / self._loud_n if self._loud_n > 1 else 0.0
+        return {
+            "duration": round(duration, 3),
+            "voiced_seconds": round(self.voiced_frames * frame_seconds, 3),
+            "pause_ratio": round(self.pause_frames / self.total_frames, 4) if self.total_frames else 0.0,
+            "pause_count": self.pause_count,
+            "loudness_variance_db": round(loudness_variance, 3),
+        }
+
+
+def compute_acoustic_metrics(video_path: Optional[str] = None, audio: Optional[np.ndarray] = None) -> Dict:
+    """Pause ratio and loudness variance, streamed block by block from the buffer or an ffmpeg pipe"""
+    if audio is not None:
+        blocks: Iterable[np.ndarray] = iter_array_blocks(audio, BLOCK_SAMPLES)
+    else:
+        blocks = iter_audio_blocks(video_path, block_bytes=BLOCK_SAMPLES * 2)
+
+    tracker = _AcousticTracker()
+    for block in blocks:
+        tracker.update(block)
+    return tracker.result()
+
+
+def compute_transcript_metrics(transcription: Union[Dict, str, None], duration: float) -> Dict:
+    """Words per minute from segment timing and filler density per 100 words"""
+    if isinstance(transcription, dict):
+        text = transcription.get("text", "")
+        segments = transcription.get("segments") or []
+    else:
+        text = transcription or ""
+        segments = []
+
+    words = re.findall(r"[a-z']+", text.lower())
+    word_count = len(words)
+
+    # Speaking time spans the first to the last timed segment; fall back to the whole recording
+    if segments:
+        speaking_seconds = max(seg["end"] for seg in segments) - min(seg["start"] for seg in segments)
+    else:
+        speaking_seconds = duration
+    wpm = word_count / (speaking_seconds / 60.0) if speaking_seconds > 0 else 0.0
+
+    fillers = sum(1 for word in words if word in FILLER_WORDS)
+    filler_density = fillers * 100.0 / word_count if word_count else 0.0
+
+    return {
+        "word_count": word_count,
+        "words_per_minute": round(wpm, 1),
+        "filler_count": fillers,
+        "filler_density": round(filler_density, 2),
+    }
+
+
+def _duration_score(duration: float) -> int:
     if duration < 3:
-        score = 40
+        return 40
     elif 3 <= duration <= 15:
-        score = 90
+        return 90
     elif 15 < duration <= 30:
-        score = 75
-    else:
-        score = 60
+        return 75
+    return 60
+
+
+def _band_score(value: float, low: float, high: float, falloff: float) -> float:
+    """100 inside [low, high], decreasing linearly to 0 at `falloff` outside the band"""
+    if low <= value <= high:
+        return 100.0
+    distance = low - value if value < low else value - high
+    return max(0.0, 100.0 * (1.0 - distance / falloff))
+
+
+def score_speech(metrics: Dict) -> int:
+    """Combine duration, pacing, pauses, fillers and loudness variation into a 0-100 score"""
+    parts = [(_duration_score(metrics["duration"]), 0.2)]
+    if "pause_ratio" in metrics:
+        parts.append((_band_score(metrics["pause_ratio"], 0.05, 0.3, 0.4), 0.2))
+        # Some loudness variation reads as expressive; none is monotone, a lot is erratic
+        parts.append((_band_score(metrics["loudness_variance_db"], 9.0, 64.0, 60.0), 0.15))
+    if metrics.get("word_count"):
+        parts.append((_band_score(metrics["words_per_minute"], 110.0, 160.0, 80.0), 0.25))
+        parts.append((_band_score(metrics["filler_density"], 0.0, 3.0, 10.0), 0.2))
+
+    total_weight = sum(weight for _, weight in parts)
+    return int(round(sum(score * weight for score, weight in parts) / total_weight))
+
+
+def analyze_speech_metrics(video_path: str, audio: Optional[np.ndarray] = None,
+                           transcription: Union[Dict, str, None] = None) -> Dict:
+    """All speech metrics plus the combined score; pass the shared PCM buffer to skip a second decode"""
+    metrics = compute_acoustic_metrics(video_path, audio)
+
+    if transcription is not None:
+        metrics.update(compute_transcript_metrics(transcription, metrics["duration"]))
+
+    metrics["score"] = score_speech(metrics)
+    return metrics
+
 
-    os.remove(temp_wav)
+def analyze_speech(video_path: str, audio: Optional[np.ndarray] = None,
+                   transcription: Union[Dict, str, None] = None) -> int:
+    score = analyze_speech_metrics(video_path, audio, transcription)["score"]
     print(score, "ye dekh le $$$$$$$$$$$$$$$")
     return score
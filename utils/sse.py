@@ -0,0 +1,53 @@
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Tell nginx not to buffer the stream, otherwise events arrive all at once
+    "X-Accel-Buffering": "no",
+}
+
+_DONE = object()
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def iterate_in_thread(factory: Callable[..., Iterator], *args, **kwargs) -> AsyncIterator:
+    """Drive a blocking generator on a worker thread and yield its items on the event loop"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+    cancelled = threading.Event()
+
+    def produce():
+        try:
+            for item in factory(*args, **kwargs):
+                if cancelled.is_set():
+                    break
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        except Exception as e:
+            asyncio.run_coroutine_threadsafe(queue.put(e), loop).result()
+        finally:
+            asyncio.run_coroutine_threadsafe(queue.put(_DONE), loop).result()
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Client went away: stop the producer after its current item and drain so it can exit
+        cancelled.set()
+        while not producer.done():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                await asyncio.sleep(0.05)
@@ -1,40 +1,33 @@
-import whisper
-import tempfile
-import subprocess
-import os
-
-def transcribe_audio(video_path: str) -> str:
-    # Load the Whisper model
-    model = whisper.load_model("base")
-
-
-    if not os.path.exists(video_path):
-        raise FileNotFoundError(f"Video file not found: {video_path}")
-    
-    # Path to ffmpeg (update this if not in PATH)
-    ffmpeg_path = "ffmpeg"  # or e.g., "C:/ffmpeg/bin/ffmpeg.exe"
-
-    # Create temporary WAV file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-        audio_path = temp_audio.name
-
-    # Convert video to mono 16kHz audio using ffmpeg
-    try:
-        subprocess.check_call([
-            ffmpeg_path, "-y", "-i", video_path,
-            "-ac", "1", "-ar", "16000",
-            audio_path
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except FileNotFoundError:
-        raise FileNotFoundError("ffmpeg not found. Please install ffmpeg and add it to your PATH.")
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"ffmpeg failed to convert the audio: {e}")
-
-    # Transcribe using Whisper
-    result = model.transcribe(audio_path)
-
-    # Clean up temp file
-    os.remove(audio_path)
-
-    # Return transcript text
-    return result["text"].strip()
\ No newline at end of file
+from typing import Dict, Iterator, Optional
+import numpy as np
+from utils.media_ingest import SAMPLE_RATE, decode_audio_pcm
+from utils.model_registry import get_transcription_backend
+from utils.parallel_transcriber import PARALLEL_MIN_SECONDS, TRANSCRIBE_PROCESSES, transcribe_parallel
+from utils.transcription_backends import STREAM_WINDOW_SECONDS
+
+def transcribe_audio_segments(video_path: str, audio: Optional[np.ndarray] = None) -> dict:
+    """Transcript text plus timed segments, in the same schema YouTubeConverter returns"""
+    # Decode once through an ffmpeg pipe straight into float32; no temp WAV, and the
+    # backend never runs ffmpeg a second time because it is handed an array, not a path
+    if audio is None:
+        audio = decode_audio_pcm(video_path)
+
+    # Long recordings are split at silences and spread over a process pool
+    if TRANSCRIBE_PROCESSES > 1 and len(audio) > PARALLEL_MIN_SECONDS * SAMPLE_RATE:
+        return transcribe_parallel(audio)
+
+    # Shared backend (openai-whisper, faster-whisper or whisper.cpp), loaded once per process
+    return get_transcription_backend().transcribe(audio)
+
+
+def transcribe_audio(video_path: str, audio: Optional[np.ndarray] = None) -> str:
+    return transcribe_audio_segments(video_path, audio)["text"]
+
+
+def iter_transcript_segments(video_path: Optional[str] = None, audio: Optional[np.ndarray] = None,
+                             window_seconds: float = STREAM_WINDOW_SECONDS) -> Iterator[Dict]:
+    """Yield timed segments as they are decoded instead of after the whole file"""
+    backend = get_transcription_backend()
+    if audio is None:
+        audio = decode_audio_pcm(video_path)
+    return backend.iter_segments(audio, window_seconds)
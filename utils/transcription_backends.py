@@ -0,0 +1,172 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+from utils.media_ingest import SAMPLE_RATE
+
+Audio = Union[str, np.ndarray]
+
+# Window length for streaming transcription; matches Whisper's own 30 s context
+STREAM_WINDOW_SECONDS = 30
+
+
+def _segment(start: float, end: float, text: str) -> Dict:
+    return {'start': start, 'end': end, 'text': text.strip()}
+
+
+class TranscriptionBackend(ABC):
+    """Common interface over speech-to-text engines.
+
+    transcribe() returns {'text', 'segments': [{'start', 'end', 'text'}], 'language'},
+    the schema utils.transcriber and YouTubeConverter already expose.
+    """
+
+    name = "base"
+
+    def __init__(self, model_size: str, compute_type: Optional[str] = None):
+        self.model_size = model_size
+        self.compute_type = compute_type
+
+    @abstractmethod
+    def transcribe(self, audio: Audio, initial_prompt: Optional[str] = None) -> Dict:
+        """Transcribe a file path or 16 kHz float32 samples"""
+
+    def iter_segments(self, audio: np.ndarray, window_seconds: float = STREAM_WINDOW_SECONDS) -> Iterator[Dict]:
+        """Yield timed segments window by window for engines without native streaming"""
+        window = int(window_seconds * SAMPLE_RATE)
+        start = 0
+        prompt = None
+        while start < len(audio):
+            chunk = np.ascontiguousarray(audio[start:start + window], dtype=np.float32)
+            offset = start / float(SAMPLE_RATE)
+            # The previous window's text keeps wording and spelling consistent across the boundary
+            result = self.transcribe(chunk, initial_prompt=prompt)
+
+            last_end = None
+            kept = []
+            for seg in result['segments']:
+                # Drop a segment cut off by the window edge; it is re-decoded at the start of the next window
+                if start + window < len(audio) and seg['end'] >= window_seconds - 0.5 and last_end is not None:
+                    break
+                last_end = seg['end']
+                kept.append(seg['text'])
+                yield {
+                    'start': round(offset + seg['start'], 2),
+                    'end': round(offset + seg['end'], 2),
+                    'text': seg['text'],
+                    'language': result['language'],
+                }
+
+            prompt = " ".join(kept)[-200:] or None
+            advance = int(last_end * SAMPLE_RATE) if last_end else window
+            start += max(advance, SAMPLE_RATE)
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Reference openai-whisper on PyTorch"""
+
+    name = "whisper"
+
+    def __init__(self, model_size: str, compute_type: Optional[str] = None):
+        super().__init__(model_size, compute_type)
+        import whisper
+        self.model = whisper.load_model(model_size)
+        # The registry shares this model across threads, and each decode installs its own
+        # KV-cache hooks on it; concurrent decodes would mix caches
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio: Audio, initial_prompt: Optional[str] = None) -> Dict:
+        if not isinstance(audio, str):
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+        # fp16 is GPU-only; asking for it on CPU just logs a warning per call
+        fp16 = self.compute_type == "float16"
+        with self._lock:
+            result = self.model.transcribe(audio, initial_prompt=initial_prompt, fp16=fp16)
+        return {
+            'text': result['text'].strip(),
+            'segments': [_segment(seg['start'], seg['end'], seg['text']) for seg in result.get('segments', [])],
+            'language': result.get('language')
+        }
+
+    def resident_bytes(self) -> int:
+        from utils.model_registry import torch_model_bytes
+        return torch_model_bytes(self.model)
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """CTranslate2 engine (faster-whisper), int8 quantized on CPU by default"""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_size: str, compute_type: Optional[str] = None):
+        super().__init__(model_size, compute_type or "int8")
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(model_size, device="cpu", compute_type=self.compute_type)
+
+    def _run(self, audio: Audio, initial_prompt: Optional[str] = None):
+        if not isinstance(audio, str):
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+        return self.model.transcribe(audio, initial_prompt=initial_prompt)
+
+    def transcribe(self, audio: Audio, initial_prompt: Optional[str] = None) -> Dict:
+        segments, info = self._run(audio, initial_prompt)
+        segments = [_segment(seg.start, seg.end, seg.text) for seg in segments]
+        return {
+            'text': " ".join(seg['text'] for seg in segments).strip(),
+            'segments': segments,
+            'language': info.language
+        }
+
+    def iter_segments(self, audio: np.ndarray, window_seconds: float = STREAM_WINDOW_SECONDS) -> Iterator[Dict]:
+        # faster-whisper decodes lazily, so segments can be forwarded as they are produced
+        segments, info = self._run(audio)
+        for seg in segments:
+            yield dict(_segment(round(seg.start, 2), round(seg.end, 2), seg.text), language=info.language)
+
+
+class WhisperCppBackend(TranscriptionBackend):
+    """whisper.cpp through the pywhispercpp bindings (ggml quantized models)"""
+
+    name = "whisper.cpp"
+
+    def __init__(self, model_size: str, compute_type: Optional[str] = None):
+        super().__init__(model_size, compute_type)
+        from pywhispercpp.model import Model
+        # compute_type selects a quantized ggml variant, e.g. "q5_1" -> base-q5_1
+        model_name = f"{model_size}-{compute_type}" if compute_type else model_size
+        self.model = Model(model_name, n_threads=os.cpu_count() or 1, print_progress=False, print_realtime=False)
+        # One whisper.cpp context is not safe to run from several threads at once
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio: Audio, initial_prompt: Optional[str] = None) -> Dict:
+        if not isinstance(audio, str):
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+        kwargs = {'initial_prompt': initial_prompt} if initial_prompt else {}
+        # whisper.cpp reports timestamps in 10 ms units
+        with self._lock:
+            raw = self.model.transcribe(audio, **kwargs)
+        segments = [_segment(seg.t0 / 100.0, seg.t1 / 100.0, seg.text) for seg in raw]
+        return {
+            'text': " ".join(seg['text'] for seg in segments).strip(),
+            'segments': segments,
+            # pywhispercpp does not expose the detected language
+            'language': None
+        }
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    WhisperCppBackend.name: WhisperCppBackend,
+}
+
+
+def create_backend(name: str, model_size: str, compute_type: Optional[str] = None) -> TranscriptionBackend:
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown transcription backend '{name}', expected one of {sorted(BACKENDS)}")
+    return backend_cls(model_size, compute_type)
@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+from utils.media_ingest import probe_duration
+
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "500")) * 1024 * 1024)
+MAX_VIDEO_SECONDS = float(os.getenv("MAX_VIDEO_SECONDS", "1800"))
+
+# Flush to disk once this much has been parsed; keeps writes large and sequential
+WRITE_BATCH_BYTES = 1 << 20
+# Allowance for multipart boundaries, headers and other small form fields
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class _UploadSink:
+    """Parser callbacks that stream the file field to a unique path and hash it in the same pass"""
+
+    def __init__(self, dest_dir: str, field_name: str, max_bytes: int):
+        self.dest_dir = dest_dir
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+
+        self.path: Optional[str] = None
+        self.filename: Optional[str] = None
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.pending: List[bytes] = []
+        self.pending_bytes = 0
+        self._file = None
+
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self._active = False
+
+    def callbacks(self) -> Dict:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._active = False
+
+    def _on_header_field(self, data, start, end):
+        self._field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        if name != self.field_name or filename is None or self.path is not None:
+            return
+        self.filename = Path(filename.decode("utf-8", "replace")).name or "upload"
+        self.path = os.path.join(self.dest_dir, f"{uuid.uuid4().hex}_{self.filename}")
+        self._file = open(self.path, "wb")
+        self._active = True
+
+    def _on_part_data(self, data, start, end):
+        if not self._active:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {self.max_bytes // (1024 * 1024)} MB limit")
+        self.digest.update(chunk)
+        self.pending.append(bytes(chunk))
+        self.pending_bytes += len(chunk)
+
+    def _on_part_end(self):
+        self._active = False
+
+    def flush(self) -> None:
+        if self._file and self.pending:
+            self._file.write(b"".join(self.pending))
+        self.pending = []
+        self.pending_bytes = 0
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        self.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def stream_upload_to_disk(request: Request, dest_dir: str = "temp", field_name: str = "file",
+                                max_bytes: int = MAX_UPLOAD_BYTES,
+                                max_seconds: Optional[float] = MAX_VIDEO_SECONDS) -> Dict:
+    """Write a multipart file field straight to a unique file in one sequential pass.
+
+    Returns the saved path, original filename, size and SHA-256 of the bytes.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes // (1024 * 1024)} MB limit")
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    sink = _UploadSink(dest_dir, field_name, max_bytes)
+    parser = MultipartParser(boundary, sink.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if sink.pending_bytes >= WRITE_BATCH_BYTES:
+                await asyncio.to_thread(sink.flush)
+        parser.finalize()
+        await asyncio.to_thread(sink.flush)
+        sink.close()
+    except BaseException:
+        sink.discard()
+        raise
+
+    if sink.path is None or sink.size == 0:
+        sink.discard()
+        raise HTTPException(status_code=400, detail=f"No file uploaded in field '{field_name}'")
+
+    if max_seconds:
+        duration = await asyncio.to_thread(probe_duration, sink.path)
+        if duration is not None and duration > max_seconds:
+            sink.discard()
+            raise HTTPException(status_code=413, detail=f"Video longer than {int(max_seconds)} seconds")
+
+    return {
+        "path": sink.path,
+        "filename": sink.filename,
+        "stored_name": os.path.basename(sink.path),
+        "size": sink.size,
+        "sha256": sink.digest.hexdigest(),
+    }
@@ -1,10 +1,10 @@
 import yt_dlp
-import whisper
 import os
 import tempfile
 from pathlib import Path
 import re
 from fpdf import FPDF
+from utils.transcriber import transcribe_audio_segments
 
 class YouTubeConverter:
     def extract_video_id(url):
@@ -62,18 +62,12 @@ class YouTubeConverter:
     def transcribe_audio_whisper(self, audio_path):
         """Transcribe audio using Whisper"""
         try:
-            model = whisper.load_model("base")
-            result = model.transcribe(audio_path)
-
-            segments = [{
-                'start': seg['start'],
-                'end': seg['end'],
-                'text': seg['text'].strip()
-            } for seg in result['segments']]
+            # Hour-long lectures are split and transcribed on every core
+            result = transcribe_audio_segments(audio_path)
 
             return {
                 'full_text': result['text'],
-                'segments': segments,
+                'segments': result['segments'],
                 'language': result['language']
             }
         except Exception as e: